@@ -0,0 +1,51 @@
+"""Small in-process TTL cache for read-heavy endpoints."""
+
+import time
+from collections.abc import Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Per-process cache whose entries expire after a fixed number of seconds.
+
+    Entries are not shared between uvicorn workers, so TTLs should stay short
+    enough that per-worker staleness is acceptable.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: dict[Hashable, tuple[Any, float]] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expiry = entry
+        if time.monotonic() >= expiry:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the oldest entry when full."""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+
+# The public source list is polled by every map view but only changes on
+# source edits (which clear it) or when a collector records an error, so a
+# short TTL bounds how stale the health flag can get. It lives here so the
+# admin routers can clear it without importing the UI router.
+public_sources_cache = TTLCache(ttl=30, maxsize=1)
+
+
+def clear_public_sources_cache() -> None:
+    """Drop the cached public source list; call after committing source changes."""
+    public_sources_cache.clear()
@@ -29,8 +29,15 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    # Fail fast instead of queueing requests behind a saturated pool, and
+    # replace connections before server-side idle timeouts drop them
+    pool_timeout=10,
+    pool_recycle=1800,
+    # Room for every route's compiled SELECTs (default 500) so polled
+    # endpoints skip SQL string generation on each request
+    query_cache_size=1200,
 )
 
 async_session_maker = async_sessionmaker(
@@ -51,6 +58,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Dependency that provides the session factory.
+
+    Endpoints that run independent queries concurrently need one session per
+    query, since a single AsyncSession cannot be shared across tasks.
+    """
+    return async_session_maker
+
+
 async def init_db() -> None:
     """Verify database is ready (migrations are run by entrypoint.sh before server start)."""
     logger.info("Database initialized (migrations handled by entrypoint)")
@@ -0,0 +1,36 @@
+"""Weak ETag helpers for polled list endpoints."""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+# Let browsers keep a copy but always revalidate it with If-None-Match.
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    """Build a weak ETag from values that change whenever the response would.
+
+    Callers pass the request parameters plus a cheap version aggregate
+    (e.g. row count and MAX(updated_at)) rather than the response itself.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """Return a 304 response if the client's If-None-Match matches etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the ETag and revalidation headers to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -13,6 +13,7 @@ from starlette.responses import FileResponse
 
 from app.config import get_settings
 from app.database import close_db, init_db
+from app.responses import ORJSONResponse
 from app.routers import (
     auth_router,
     config_router,
@@ -25,6 +26,7 @@ from app.routers import (
     users_router,
     utilization_router,
 )
+from app.routers.ui import shutdown_solar_analysis_pool
 from app.services.collector_manager import collector_manager
 from app.services.retention import retention_service
 from app.services.scheduler import scheduler_service
@@ -76,6 +78,7 @@ async def lifespan(app: FastAPI):
     await scheduler_service.stop()
     await retention_service.stop()
     await collector_manager.stop()
+    shutdown_solar_analysis_pool()
     await close_db()
 
     logger.info("Shutdown complete")
@@ -87,6 +90,7 @@ app = FastAPI(
     description="Management and oversight application for MeshMonitor and Meshtastic MQTT",
     version=APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add session middleware (required for OIDC)
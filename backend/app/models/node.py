@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Double,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -78,4 +79,9 @@ class Node(Base):
     # Relationships
     source: Mapped["Source"] = relationship("Source", back_populates="nodes")  # noqa: F821
 
-    __table_args__ = (UniqueConstraint("source_id", "node_num", name="uq_nodes_source_node"),)
+    __table_args__ = (
+        UniqueConstraint("source_id", "node_num", name="uq_nodes_source_node"),
+        # Serves per-node_num lookups ordered newest-first across sources
+        Index("ix_nodes_node_num_last_heard", "node_num", text("last_heard DESC NULLS LAST")),
+        Index("ix_nodes_role", "role", postgresql_where=text("role IS NOT NULL")),
+    )
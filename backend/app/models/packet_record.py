@@ -32,6 +32,12 @@ class PacketRecord(Base):
             "received_at",
             unique=True,
         ),
+        Index(
+            "ix_packet_records_received_type",
+            "received_at",
+            "packet_type",
+            postgresql_include=["from_node_num", "to_node_num", "source_id", "meshtastic_id"],
+        ),
     )
 
     id: Mapped[str] = mapped_column(
@@ -0,0 +1,15 @@
+"""Lightweight table construct for the solar_daily materialized view."""
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, column, table
+
+# Maintained by migration h8i9j0k1l2m3 and refreshed by the retention job;
+# not part of Base.metadata so create_all never tries to build it as a table.
+solar_daily = table(
+    "solar_daily",
+    column("node_num", BigInteger),
+    column("day", DateTime(timezone=True)),
+    column("metric", String),
+    column("readings", Integer),
+    column("min_value", Float),
+    column("max_value", Float),
+)
@@ -22,6 +22,13 @@ class SolarProduction(Base):
             "timestamp",
             unique=True,
         ),
+        # Covers the hourly /solar aggregation and its version query
+        Index(
+            "ix_solar_production_timestamp_source",
+            "timestamp",
+            "source_id",
+            postgresql_include=["watt_hours", "received_at"],
+        ),
     )
 
     id: Mapped[str] = mapped_column(
@@ -4,7 +4,7 @@ import enum
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import BigInteger, DateTime, Enum, Float, ForeignKey, Index, Integer, String
+from sqlalchemy import BigInteger, DateTime, Enum, Float, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -37,6 +37,24 @@ class Telemetry(Base):
             "metric_name",
             unique=True,
         ),
+        Index(
+            "ix_telemetry_received_type",
+            "received_at",
+            "telemetry_type",
+            postgresql_include=["node_num", "source_id", "meshtastic_id", "metric_name"],
+        ),
+        Index(
+            "ix_telemetry_node_received",
+            "node_num",
+            "received_at",
+            postgresql_include=["source_id", "metric_name", "raw_value"],
+        ),
+        Index(
+            "ix_telemetry_position_received",
+            "received_at",
+            postgresql_include=["node_num", "latitude", "longitude"],
+            postgresql_where=text("latitude IS NOT NULL AND longitude IS NOT NULL"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(
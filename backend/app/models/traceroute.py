@@ -23,6 +23,11 @@ class Traceroute(Base):
             "received_at",
             unique=True,
         ),
+        Index(
+            "ix_traceroutes_received_covering",
+            "received_at",
+            postgresql_include=["from_node_num", "to_node_num", "source_id", "meshtastic_id"],
+        ),
     )
 
     id: Mapped[str] = mapped_column(
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import Response
 
 from app.auth.middleware import require_permission
+from app.cache import clear_public_sources_cache
 from app.database import get_db
 from app.models import Source
 from app.models.settings import SystemSetting
@@ -342,6 +343,8 @@ async def import_config(
                 analysis_configs_imported.append("solar_schedule")
 
         await db.commit()
+        if sources_imported:
+            clear_public_sources_cache()
 
         return ImportResult(
             success=True,
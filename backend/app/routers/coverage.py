@@ -228,13 +228,13 @@ async def generate_coverage(
     # Get position records (rows with both lat and lon populated)
     # Works for both MeshMonitor (separate metric rows) and MQTT (combined rows)
     pos_query = (
-        select(Telemetry)
+        select(Telemetry.latitude, Telemetry.longitude)
         .where(Telemetry.received_at >= cutoff)
         .where(Telemetry.latitude.isnot(None))
         .where(Telemetry.longitude.isnot(None))
     )
     pos_result = await db.execute(pos_query)
-    pos_records = pos_result.scalars().all()
+    pos_records = pos_result.all()
 
     positions = [
         {"latitude": r.latitude, "longitude": r.longitude}
@@ -391,13 +391,13 @@ async def get_position_history(
     # Get position records (rows with both lat and lon populated)
     # Works for both MeshMonitor (separate metric rows) and MQTT (combined rows)
     pos_query = (
-        select(Telemetry)
+        select(Telemetry.latitude, Telemetry.longitude)
         .where(Telemetry.received_at >= cutoff)
         .where(Telemetry.latitude.isnot(None))
         .where(Telemetry.longitude.isnot(None))
     )
     pos_result = await db.execute(pos_query)
-    pos_records = pos_result.scalars().all()
+    pos_records = pos_result.all()
 
     positions = [
         PositionPoint(lat=r.latitude, lng=r.longitude)
@@ -516,13 +516,13 @@ async def _get_position_points(
     # Get position records (rows with both lat and lon populated)
     # Works for both MeshMonitor (separate metric rows) and MQTT (combined rows)
     pos_query = (
-        select(Telemetry)
+        select(Telemetry.latitude, Telemetry.longitude, Telemetry.node_num, Telemetry.received_at)
         .where(Telemetry.received_at >= cutoff)
         .where(Telemetry.latitude.isnot(None))
         .where(Telemetry.longitude.isnot(None))
     )
     pos_result = await db.execute(pos_query)
-    pos_records = pos_result.scalars().all()
+    pos_records = pos_result.all()
 
     positions = [
         {
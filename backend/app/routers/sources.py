@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.middleware import require_permission
+from app.cache import clear_public_sources_cache
 from app.database import get_db
 from app.models import Source
 from app.models.source import SourceType
@@ -54,6 +55,8 @@ async def create_meshmonitor_source(
 
     # Start collector for the new source
     await collector_manager.add_source(source)
+    await db.commit()
+    clear_public_sources_cache()
 
     return SourceResponse.model_validate(source)
 
@@ -82,6 +85,8 @@ async def create_mqtt_source(
 
     # Start collector for the new source
     await collector_manager.add_source(source)
+    await db.commit()
+    clear_public_sources_cache()
 
     return SourceResponse.model_validate(source)
 
@@ -124,6 +129,8 @@ async def update_meshmonitor_source(
 
     # Update collector with new config
     await collector_manager.update_source(source)
+    await db.commit()
+    clear_public_sources_cache()
 
     return SourceResponse.model_validate(source)
 
@@ -152,6 +159,8 @@ async def update_mqtt_source(
 
     # Update collector with new config
     await collector_manager.update_source(source)
+    await db.commit()
+    clear_public_sources_cache()
 
     return SourceResponse.model_validate(source)
 
@@ -172,6 +181,8 @@ async def delete_source(
     await collector_manager.remove_source(source_id)
 
     await db.delete(source)
+    await db.commit()
+    clear_public_sources_cache()
 
 
 @router.post("/{source_id}/test", response_model=SourceTestResult)
@@ -1,13 +1,55 @@
 """UI data endpoints (internal use for frontend)."""
 
-from datetime import UTC, datetime, timedelta
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, literal_column, select
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import heapq
+import multiprocessing
+import os
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from functools import cache
+from itertools import chain
+from operator import itemgetter
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    CompoundSelect,
+    Exists,
+    Float,
+    Numeric,
+    Row,
+    Select,
+    String,
+    and_,
+    bindparam,
+    case,
+    cast,
+    distinct,
+    exists,
+    extract,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    union,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, distinct_on
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.auth.middleware import require_tab_access
-from app.database import get_db
+from app.cache import TTLCache, public_sources_cache
+from app.database import get_db, get_session_maker
+from app.etag import not_modified, set_etag, weak_etag
 from app.models import (
     Message,
     Node,
@@ -19,133 +61,182 @@ from app.models import (
     Traceroute,
 )
 from app.models.packet_record import PacketRecordType
+from app.models.solar_daily import solar_daily
 from app.models.source import SourceType
 from app.models.telemetry import TelemetryType
+from app.responses import ORJSONResponse, ORJSONStreamingResponse
 from app.schemas.node import NodeResponse, NodeSummary
-from app.schemas.telemetry import TelemetryHistory, TelemetryHistoryPoint, TelemetryResponse
+from app.schemas.telemetry import TelemetryHistory, TelemetryResponse
 from app.services.collector_manager import collector_manager
 from app.services.retention import DEFAULT_RETENTION
-from app.telemetry_registry import CAMEL_TO_METRIC, METRIC_REGISTRY, NON_MESH_METRICS
+from app.telemetry_registry import (
+    CAMEL_TO_METRIC,
+    METRIC_NAME_ALIASES,
+    METRIC_REGISTRY,
+    NON_MESH_METRICS,
+)
 
 router = APIRouter(prefix="/api", tags=["ui"])
 
 
-class SourceSummary:
-    """Simple source summary for public display."""
-
-    def __init__(self, id: str, name: str, type: str, enabled: bool, last_poll_at: datetime | None):
-        self.id = id
-        self.name = name
-        self.type = type
-        self.enabled = enabled
-        self.last_poll_at = last_poll_at
-
-
-@router.get("/sources")
+@router.get("/sources", response_class=ORJSONResponse)
 async def list_sources_public(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _access: None = Depends(require_tab_access("map")),
-) -> list[dict]:
-    """List sources (public, names only)."""
-    result = await db.execute(select(Source).order_by(Source.name))
-    sources = result.scalars().all()
-    return [
-        {
-            "id": s.id,
-            "name": s.name,
-            "type": s.type.value,
-            "enabled": s.enabled,
-            "healthy": s.enabled and s.last_error is None,
-        }
-        for s in sources
-    ]
+) -> Response:
+    """List sources (public, names only).
+
+    The rendered body and its ETag are cached for a few seconds, so repeat
+    polls within the window skip the database entirely.
+    """
+    cached = public_sources_cache.get("sources")
+    if cached is None:
+        # Only the public columns are selected, so no ORM objects are built
+        result = await db.execute(
+            select(Source.id, Source.name, Source.type, Source.enabled, Source.last_error)
+            .order_by(Source.name)
+        )
+        body = orjson.dumps([
+            {
+                "id": source_id,
+                "name": name,
+                "type": source_type.value,
+                "enabled": enabled,
+                "healthy": enabled and last_error is None,
+            }
+            for source_id, name, source_type, enabled, last_error in result
+        ])
+        cached = (weak_etag(body), body)
+        public_sources_cache.set("sources", cached)
+
+    etag, body = cached
+    if (not_modified_response := not_modified(request, etag)) is not None:
+        return not_modified_response
+    response = ORJSONResponse(body)
+    set_etag(response, etag)
+    return response
+
 
+def _node_summary_query() -> Select:
+    """Select the NodeSummary columns for nodes joined to their source.
 
-@router.get("/nodes", response_model=list[NodeSummary])
+    The node list endpoints return these rows as plain dicts through
+    ORJSONResponse with response_model=None. Selecting columns skips ORM
+    hydration, and the values come from typed columns, so validating every
+    record against NodeSummary again is pure overhead. NodeSummary still
+    documents the shape in OpenAPI.
+    """
+    return select(
+        Node.id,
+        Node.source_id,
+        Source.name.label("source_name"),
+        Node.node_num,
+        Node.node_id,
+        Node.short_name,
+        Node.long_name,
+        Node.hw_model,
+        Node.role,
+        Node.latitude,
+        Node.longitude,
+        Node.snr,
+        Node.rssi,
+        Node.hops_away,
+        Node.last_heard,
+    ).join(Source)
+
+
+@router.get(
+    "/nodes",
+    response_class=ORJSONResponse,
+    response_model=None,
+    responses={200: {"model": list[NodeSummary]}},
+)
 async def list_nodes(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     source_id: str | None = Query(default=None, description="Filter by source ID"),
     active_only: bool = Query(default=False, description="Only show recently active nodes"),
     active_hours: int = Query(default=1, ge=1, le=8760, description="Hours to consider a node active (1-8760)"),
+    latest_per_node: bool = Query(default=False, description="Only return the most recently heard record per node_num"),
     _access: None = Depends(require_tab_access("map")),
-) -> list[NodeSummary]:
+) -> Response:
     """List all nodes across all sources.
 
     Returns all node records from all sources so the frontend can filter
     by enabled sources and then deduplicate, ensuring nodes visible from
     multiple sources remain shown when any of their sources is enabled.
-    """
-    query = select(Node, Source.name.label("source_name")).join(Source)
+    Clients that want one record per node_num can pass latest_per_node to
+    have the database keep only the most recently heard record.
 
+    Responses carry a weak ETag so polling clients can revalidate with
+    If-None-Match and get a 304 when nothing has changed.
+    """
+    filters = []
     if source_id:
-        query = query.where(Node.source_id == source_id)
+        filters.append(Node.source_id == source_id)
 
     if active_only:
         cutoff = datetime.now(UTC) - timedelta(hours=active_hours)
-        query = query.where(Node.last_heard >= cutoff)
-
-    query = query.order_by(Node.last_heard.desc().nullslast())
+        filters.append(Node.last_heard >= cutoff)
+
+    # Row count catches nodes aging out of the active window; updated_at
+    # catches edits to any returned node or source name.
+    version = (
+        await db.execute(
+            select(func.count(), func.max(Node.updated_at), func.max(Source.updated_at))
+            .select_from(Node)
+            .join(Source)
+            .where(*filters)
+        )
+    ).one()
+    etag = weak_etag(source_id, active_only, active_hours, latest_per_node, *version)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+
+    query = _node_summary_query().where(*filters).order_by(Node.last_heard.desc().nullslast())
+    if latest_per_node:
+        # DISTINCT ON keeps the newest record per node_num in SQL, so the
+        # per-source duplicates never leave the database
+        latest_ids = (
+            select(Node.id)
+            .where(*filters)
+            .ext(distinct_on(Node.node_num))
+            .order_by(Node.node_num, Node.last_heard.desc().nullslast())
+        )
+        query = query.where(Node.id.in_(latest_ids))
 
     result = await db.execute(query)
-    rows = result.all()
 
-    return [
-        NodeSummary(
-            id=node.id,
-            source_id=node.source_id,
-            source_name=source_name,
-            node_num=node.node_num,
-            node_id=node.node_id,
-            short_name=node.short_name,
-            long_name=node.long_name,
-            hw_model=node.hw_model,
-            role=node.role,
-            latitude=node.latitude,
-            longitude=node.longitude,
-            snr=node.snr,
-            rssi=node.rssi,
-            hops_away=node.hops_away,
-            last_heard=node.last_heard,
-        )
-        for node, source_name in rows
-    ]
+    # UTC timestamps keep the Z suffix NodeSummary used to write
+    response = ORJSONResponse([dict(row) for row in result.mappings()], option=orjson.OPT_UTC_Z)
+    set_etag(response, etag)
+    return response
 
 
-@router.get("/nodes/by-node-num/{node_num}")
+@router.get(
+    "/nodes/by-node-num/{node_num}",
+    response_class=ORJSONResponse,
+    response_model=None,
+    responses={200: {"model": list[NodeSummary]}},
+)
 async def get_nodes_by_node_num(
     node_num: int,
     db: AsyncSession = Depends(get_db),
     _access: None = Depends(require_tab_access("nodes")),
-) -> list[NodeSummary]:
+) -> ORJSONResponse:
     """Get all node records across sources for a given node_num."""
     result = await db.execute(
-        select(Node, Source.name.label("source_name"))
-        .join(Source)
+        _node_summary_query()
         .where(Node.node_num == node_num)
         .order_by(Node.last_heard.desc().nullslast())
     )
-    rows = result.all()
+    return ORJSONResponse([dict(row) for row in result.mappings()], option=orjson.OPT_UTC_Z)
 
-    return [
-        NodeSummary(
-            id=node.id,
-            source_id=node.source_id,
-            source_name=source_name,
-            node_num=node.node_num,
-            node_id=node.node_id,
-            short_name=node.short_name,
-            long_name=node.long_name,
-            hw_model=node.hw_model,
-            role=node.role,
-            latitude=node.latitude,
-            longitude=node.longitude,
-            snr=node.snr,
-            rssi=node.rssi,
-            hops_away=node.hops_away,
-            last_heard=node.last_heard,
-        )
-        for node, source_name in rows
-    ]
+
+# Roles only change when a collector sees a node switch role, so every UI
+# load within the window shares one GROUP BY over the nodes table.
+_node_roles_cache = TTLCache(ttl=30, maxsize=1)
 
 
 @router.get("/nodes/roles")
@@ -153,12 +244,23 @@ async def list_node_roles(
     db: AsyncSession = Depends(get_db),
     _access: None = Depends(require_tab_access("map")),
 ) -> list[str]:
-    """Get list of unique node roles in the database."""
+    """Get list of unique node roles in the database.
+
+    Responses are cached for a few seconds.
+    """
+    cached = _node_roles_cache.get("roles")
+    if cached is not None:
+        return list(cached)
+
     result = await db.execute(
-        select(Node.role).distinct().where(Node.role.isnot(None))
+        select(Node.role)
+        .where(Node.role.isnot(None), Node.role != "")
+        .group_by(Node.role)
+        .order_by(Node.role)
     )
-    roles = [row[0] for row in result.all() if row[0]]
-    return sorted(roles)
+    roles = tuple(result.scalars().all())
+    _node_roles_cache.set("roles", roles)
+    return list(roles)
 
 
 @router.get("/nodes/{node_id}", response_model=NodeResponse)
@@ -185,48 +287,62 @@ async def get_node(
     return response
 
 
-@router.get("/telemetry/{node_num}")
+@router.get(
+    "/telemetry/{node_num}",
+    response_class=ORJSONResponse,
+    response_model=None,
+    responses={200: {"model": list[TelemetryResponse]}},
+)
 async def get_telemetry(
     node_num: int,
     db: AsyncSession = Depends(get_db),
     hours: int = Query(default=24, ge=1, le=168, description="Hours of history to fetch"),
     _access: None = Depends(require_tab_access("nodes")),
-) -> list[TelemetryResponse]:
+) -> Response:
     """Get recent telemetry for a node across all sources."""
     cutoff = datetime.now(UTC) - timedelta(hours=hours)
 
-    result = await db.execute(
-        select(Telemetry, Source.name.label("source_name"))
+    # Select just the response columns and return them as plain dicts: the
+    # values come straight from typed database columns, so ORM hydration,
+    # pydantic validation and jsonable_encoder are pure overhead. Rows are
+    # streamed in batches rather than materialized up front.
+    result = await db.stream(
+        select(
+            Telemetry.id,
+            Telemetry.source_id,
+            Source.name.label("source_name"),
+            Telemetry.node_num,
+            Telemetry.telemetry_type,
+            Telemetry.battery_level,
+            Telemetry.voltage,
+            Telemetry.channel_utilization,
+            Telemetry.air_util_tx,
+            Telemetry.uptime_seconds,
+            Telemetry.temperature,
+            Telemetry.relative_humidity,
+            Telemetry.barometric_pressure,
+            Telemetry.current,
+            Telemetry.snr_local,
+            Telemetry.snr_remote,
+            Telemetry.rssi,
+            Telemetry.received_at,
+        )
         .join(Source)
         .where(Telemetry.node_num == node_num)
         .where(Telemetry.received_at >= cutoff)
         .order_by(Telemetry.received_at.desc())
+        .execution_options(yield_per=1000)
     )
-    rows = result.all()
 
-    return [
-        TelemetryResponse(
-            id=t.id,
-            source_id=t.source_id,
-            source_name=source_name,
-            node_num=t.node_num,
-            telemetry_type=t.telemetry_type.value,
-            battery_level=t.battery_level,
-            voltage=t.voltage,
-            channel_utilization=t.channel_utilization,
-            air_util_tx=t.air_util_tx,
-            uptime_seconds=t.uptime_seconds,
-            temperature=t.temperature,
-            relative_humidity=t.relative_humidity,
-            barometric_pressure=t.barometric_pressure,
-            current=t.current,
-            snr_local=t.snr_local,
-            snr_remote=t.snr_remote,
-            rssi=t.rssi,
-            received_at=t.received_at,
-        )
-        for t, source_name in rows
-    ]
+    # Each streamed batch is encoded and sent as soon as it arrives, with
+    # the Z-suffixed timestamps TelemetryResponse used to write
+    return ORJSONStreamingResponse(
+        (
+            [{**row, "telemetry_type": row["telemetry_type"].value} for row in rows]
+            async for rows in result.mappings().partitions()
+        ),
+        option=orjson.OPT_UTC_Z,
+    )
 
 
 @router.get("/telemetry/{node_num}/metrics")
@@ -303,14 +419,19 @@ async def get_available_metrics(
     }
 
 
-@router.get("/telemetry/{node_num}/history/{metric}")
+@router.get(
+    "/telemetry/{node_num}/history/{metric}",
+    response_class=ORJSONResponse,
+    response_model=None,
+    responses={200: {"model": TelemetryHistory}},
+)
 async def get_telemetry_history(
     node_num: int,
     metric: str,
     db: AsyncSession = Depends(get_db),
     hours: int = Query(default=24, ge=1, le=168, description="Hours of history to fetch"),
     _access: None = Depends(require_tab_access("graphs")),
-) -> TelemetryHistory:
+) -> ORJSONResponse:
     """Get historical data for a specific telemetry metric."""
     # Look up metric in registry (accept both snake_case and camelCase)
     metric_def = METRIC_REGISTRY.get(metric)
@@ -326,71 +447,66 @@ async def get_telemetry_history(
 
     # Match both the requested name and the canonical snake_case name,
     # plus any camelCase variants that map to this metric
-    metric_names = {metric, metric_def.name}
-    for camel, snake in CAMEL_TO_METRIC.items():
-        if snake == metric_def.name:
-            metric_names.add(camel)
+    metric_names = METRIC_NAME_ALIASES[metric_def.name] | {metric}
 
-    result = await db.execute(
-        select(Telemetry, Source.name.label("source_name"))
-        .join(Source)
+    # Only the columns each point needs are selected, and the value column
+    # is chosen once here rather than read with getattr per row.
+    point_legs = [
+        select(
+            Telemetry.received_at,
+            Telemetry.source_id,
+            Telemetry.raw_value.label("value"),
+            literal_column("0").label("priority"),
+        )
         .where(Telemetry.node_num == node_num)
         .where(Telemetry.received_at >= cutoff)
         .where(Telemetry.metric_name.in_(metric_names))
         .where(Telemetry.raw_value.isnot(None))
-        .order_by(Telemetry.received_at.asc())
-    )
-    rows = result.all()
-
-    data = []
-    seen_timestamps: set[tuple] = set()
-    for t, source_name in rows:
-        key = (t.received_at, t.source_id)
-        if key in seen_timestamps:
-            continue
-        seen_timestamps.add(key)
-        data.append(
-            TelemetryHistoryPoint(
-                timestamp=t.received_at,
-                source_id=t.source_id,
-                source_name=source_name,
-                value=float(t.raw_value),
-            )
-        )
+    ]
 
     # Backward compat: also check dedicated column for old data without metric_name
     if metric_def.dedicated_column:
         col = getattr(Telemetry, metric_def.dedicated_column, None)
         if col is not None:
-            legacy_result = await db.execute(
-                select(Telemetry, Source.name.label("source_name"))
-                .join(Source)
+            point_legs.append(
+                select(
+                    Telemetry.received_at,
+                    Telemetry.source_id,
+                    cast(col, Float).label("value"),
+                    literal_column("1").label("priority"),
+                )
                 .where(Telemetry.node_num == node_num)
                 .where(Telemetry.received_at >= cutoff)
                 .where(col.isnot(None))
                 .where(Telemetry.metric_name.is_(None))
-                .order_by(Telemetry.received_at.asc())
             )
-            for t, source_name in legacy_result.all():
-                key = (t.received_at, t.source_id)
-                if key in seen_timestamps:
-                    continue
-                seen_timestamps.add(key)
-                value = getattr(t, metric_def.dedicated_column)
-                if value is not None:
-                    data.append(
-                        TelemetryHistoryPoint(
-                            timestamp=t.received_at,
-                            source_id=t.source_id,
-                            source_name=source_name,
-                            value=float(value),
-                        )
-                    )
-
-    # Sort all data by timestamp
-    data.sort(key=lambda p: p.timestamp)
-
-    return TelemetryHistory(metric=metric_def.label, unit=metric_def.unit, data=data)
+
+    # DISTINCT ON keeps one point per (timestamp, source), preferring
+    # metric_name rows over legacy columns, and returns them in time order,
+    # so deduplication and sorting never happen in Python.
+    points = union_all(*point_legs).subquery()
+    result = await db.stream(
+        select(points.c.received_at, points.c.source_id, Source.name, points.c.value)
+        .join(Source, Source.id == points.c.source_id)
+        .ext(distinct_on(points.c.received_at, points.c.source_id))
+        .order_by(points.c.received_at, points.c.source_id, points.c.priority)
+        .execution_options(yield_per=1000)
+    )
+
+    data = [
+        {
+            "timestamp": received_at,
+            "source_id": source_id,
+            "source_name": source_name,
+            "value": value,
+        }
+        async for received_at, source_id, source_name, value in result
+    ]
+
+    return ORJSONResponse(
+        {"metric": metric_def.label, "unit": metric_def.unit, "data": data},
+        option=orjson.OPT_UTC_Z,
+    )
 
 
 @router.get("/sources/collection-status")
@@ -407,70 +523,141 @@ async def get_collection_statuses() -> dict[str, dict]:
     return collector_manager.get_all_collection_statuses()
 
 
-@router.get("/position-history")
+@router.get("/position-history", response_class=ORJSONResponse)
 async def get_position_history(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     days: int = Query(default=7, ge=1, le=365, description="Days of history"),
+    columnar: bool = Query(default=False, description="Return one array per field instead of one object per record"),
     _access: None = Depends(require_tab_access("map")),
-) -> list[dict]:
+) -> Response:
     """Get historical position data for coverage analysis.
 
     Returns all position telemetry records within the specified time range.
     Each record contains node_num, latitude, longitude, and timestamp.
+
+    With columnar=true the response is instead a single object holding
+    node_num, latitude, longitude and timestamp (epoch milliseconds) arrays,
+    which orjson serializes straight from numpy without per-record dicts.
     """
     cutoff = datetime.now(UTC) - timedelta(days=days)
 
     # Get position records (rows with both lat and lon populated)
     # Works for both MeshMonitor (separate metric rows) and MQTT (combined rows)
-    result = await db.execute(
-        select(Telemetry)
-        .where(Telemetry.received_at >= cutoff)
-        .where(Telemetry.latitude.isnot(None))
-        .where(Telemetry.longitude.isnot(None))
+    has_position = (
+        Telemetry.received_at >= cutoff,
+        Telemetry.latitude.isnot(None),
+        Telemetry.longitude.isnot(None),
+    )
+
+    # Telemetry is insert-only, so the count and newest received_at in the
+    # window change whenever the response would; both come from the partial
+    # position index.
+    version = (
+        await db.execute(select(func.count(), func.max(Telemetry.received_at)).where(*has_position))
+    ).one()
+    etag = weak_etag(days, columnar, *version)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+
+    # Select only the four returned columns so the partial covering index
+    # ix_telemetry_position_received can answer this with an index-only scan.
+    timestamp = (
+        (extract("epoch", Telemetry.received_at) * 1000).cast(BigInteger)
+        if columnar
+        else Telemetry.received_at
+    )
+    result = await db.stream(
+        select(
+            Telemetry.node_num,
+            Telemetry.latitude,
+            Telemetry.longitude,
+            timestamp,
+        )
+        .where(*has_position)
         .order_by(Telemetry.received_at.desc())
+        .execution_options(yield_per=1000)
     )
-    records = result.scalars().all()
 
-    return [
-        {
-            "node_num": r.node_num,
-            "latitude": r.latitude,
-            "longitude": r.longitude,
-            "timestamp": r.received_at.isoformat(),
-        }
-        for r in records
-    ]
+    if columnar:
+        # node_num (< 2**32) and epoch ms (< 2**53) are exact in float64, so
+        # all four columns load in one pass per streamed batch and are split
+        # afterwards; only one batch of row objects is held at a time.
+        chunks = [
+            np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=4 * len(rows))
+            async for rows in result.partitions()
+        ]
+        table = (np.concatenate(chunks) if chunks else np.empty(0)).reshape(-1, 4)
+        response = ORJSONResponse({
+            "node_num": table[:, 0].astype(np.int64),
+            "latitude": np.ascontiguousarray(table[:, 1]),
+            "longitude": np.ascontiguousarray(table[:, 2]),
+            "timestamp": table[:, 3].astype(np.int64),
+        })
+    else:
+        # Each streamed batch is encoded by orjson and sent as it arrives,
+        # so only one batch of records is held at a time.
+        response = ORJSONStreamingResponse(
+            [
+                {
+                    "node_num": node_num,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "timestamp": received_at,
+                }
+                for node_num, latitude, longitude, received_at in rows
+            ]
+            async for rows in result.partitions()
+        )
+    set_etag(response, etag)
+    return response
 
 
-@router.get("/traceroutes")
+@router.get("/traceroutes", response_class=ORJSONResponse)
 async def list_traceroutes(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     hours: int = Query(default=24, ge=1, le=168, description="Hours of history"),
     _access: None = Depends(require_tab_access("map")),
-) -> list[dict]:
+) -> Response:
     """Get recent traceroutes for rendering on the map."""
     cutoff = datetime.now(UTC) - timedelta(hours=hours)
 
-    result = await db.execute(
-        select(Traceroute)
+    # Traceroutes are insert-only, so the count and newest received_at in
+    # the window change whenever the response would.
+    version = (
+        await db.execute(
+            select(func.count(), func.max(Traceroute.received_at)).where(
+                Traceroute.received_at >= cutoff
+            )
+        )
+    ).one()
+    etag = weak_etag(hours, *version)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+
+    # Plain column rows skip ORM hydration; orjson serializes received_at.
+    result = await db.stream(
+        select(
+            Traceroute.id,
+            Traceroute.source_id,
+            Traceroute.from_node_num,
+            Traceroute.to_node_num,
+            Traceroute.route,
+            Traceroute.route_back,
+            Traceroute.route_positions,
+            Traceroute.received_at,
+        )
         .where(Traceroute.received_at >= cutoff)
         .order_by(Traceroute.received_at.desc())
+        .execution_options(yield_per=1000)
     )
-    traceroutes = result.scalars().all()
 
-    return [
-        {
-            "id": t.id,
-            "source_id": t.source_id,
-            "from_node_num": t.from_node_num,
-            "to_node_num": t.to_node_num,
-            "route": t.route,
-            "route_back": t.route_back,
-            "route_positions": t.route_positions,
-            "received_at": t.received_at.isoformat(),
-        }
-        for t in traceroutes
-    ]
+    response = ORJSONStreamingResponse(
+        [dict(row) for row in rows] async for rows in result.mappings().partitions()
+    )
+    set_etag(response, etag)
+    return response
 
 
 @router.get("/connections")
@@ -697,21 +884,21 @@ async def get_edge_details(
         all_node_nums.add(t["from_node_num"])
         all_node_nums.add(t["to_node_num"])
 
-    # Look up node names
+    # Look up node names (only the name columns, not full Node entities)
     node_result = await db.execute(
-        select(Node).where(Node.node_num.in_(all_node_nums))
+        select(Node.node_num, Node.long_name, Node.short_name).where(Node.node_num.in_(all_node_nums))
     )
-    node_map = {n.node_num: n for n in node_result.scalars().all()}
+    node_map = {n.node_num: n for n in node_result.all()}
 
     def node_name(num: int) -> str:
         n = node_map.get(num)
-        return (n.long_name or n.short_name or f"!{num:08x}") if n else f"!{num:08x}"
+        return (n.long_name or n.short_name if n else None) or _hex_node_id(num)
 
     def node_info(num: int) -> dict:
         n = node_map.get(num)
         return {
             "node_num": num,
-            "name": (n.long_name or n.short_name or f"!{num:08x}") if n else f"!{num:08x}",
+            "name": node_name(num),
             "short_name": n.short_name if n else None,
         }
 
@@ -743,15 +930,53 @@ async def get_edge_details(
     }
 
 
+def _hex_node_id(node_num: int) -> str:
+    """Fallback display name for a node without a long or short name."""
+    return f"!{node_num:08x}"
+
+
+async def _node_display_names(db: AsyncSession, node_nums: Iterable[int]) -> dict[int, str]:
+    """Map node_nums to display names: long name, else short name, else !hex id.
+
+    The fallback chain is evaluated in SQL so only (node_num, name) pairs for
+    the requested nodes are transferred, one per node: with a record per
+    source, the most recently heard record's name wins.
+    """
+    node_nums = list(node_nums)
+    if not node_nums:
+        return {}
+    display_name = func.coalesce(
+        func.nullif(Node.long_name, ""),
+        func.nullif(Node.short_name, ""),
+        func.concat("!", func.lpad(func.to_hex(Node.node_num), 8, "0")),
+    )
+    result = await db.execute(
+        select(Node.node_num, display_name)
+        .where(Node.node_num.in_(node_nums))
+        .ext(distinct_on(Node.node_num))
+        .order_by(Node.node_num, Node.last_heard.desc().nullslast())
+    )
+    return dict(result.all())
+
+
+def _utc_hour(column: ColumnElement[datetime]) -> ColumnElement[Any]:
+    """SQL expression for the UTC hour (0-23) of a timestamptz column."""
+    return extract("hour", func.timezone(literal_column("'UTC'"), column)).label("hour")
+
+
 def _analyze_metric_for_solar_patterns(
-    values: list[dict],
+    times: list[datetime],
+    hours: np.ndarray,
+    values: np.ndarray,
     is_battery: bool,
     previous_day_sunset: dict | None,
 ) -> dict | None:
     """Analyze a single metric (battery or voltage) for solar patterns.
 
     Args:
-        values: List of {"time": datetime, "value": float} dicts, sorted by time
+        times: Reading timestamps for one day, sorted ascending
+        hours: UTC hour of each reading, as selected by _utc_hour()
+        values: float64 array of readings aligned with times
         is_battery: True for battery_level, False for voltage
         previous_day_sunset: Previous day's sunset data for discharge calculation
 
@@ -766,9 +991,8 @@ def _analyze_metric_for_solar_patterns(
         return None
 
     # Calculate daily variance - nodes on wall power have near-constant values
-    all_values = [v["value"] for v in values]
-    min_value = min(all_values)
-    max_value = max(all_values)
+    min_value = float(values.min())
+    max_value = float(values.max())
     daily_range = max_value - min_value
 
     # Set thresholds based on metric type
@@ -798,47 +1022,32 @@ def _analyze_metric_for_solar_patterns(
         return None
 
     # Find morning values (6am-10am) and afternoon values (12pm-6pm)
-    morning_values = [v for v in values if 6 <= v["time"].hour <= 10]
-    afternoon_values = [v for v in values if 12 <= v["time"].hour <= 18]
+    morning_idx = np.flatnonzero((hours >= 6) & (hours <= 10))
+    afternoon_idx = np.flatnonzero((hours >= 12) & (hours <= 18))
 
     # If we don't have readings in both time windows, use simpler peak detection
-    if morning_values and afternoon_values:
+    # (argmin/argmax return the first extreme, matching min()/max() on lists)
+    if morning_idx.size and afternoon_idx.size:
         # Solar pattern: morning low < afternoon high (charging during daylight)
-        morning_low = min(morning_values, key=lambda v: v["value"])
-        afternoon_high = max(afternoon_values, key=lambda v: v["value"])
+        sunrise_idx = int(morning_idx[values[morning_idx].argmin()])
+        peak_idx = int(afternoon_idx[values[afternoon_idx].argmax()])
+    else:
+        # Fallback: use overall max as peak and the lowest value before it as sunrise
+        peak_idx = int(values.argmax())
+        sunrise_idx = int(values[:peak_idx + 1].argmin())
 
-        sunrise_value = morning_low["value"]
-        sunrise_time = morning_low["time"]
-        peak_value = afternoon_high["value"]
-        peak_time = afternoon_high["time"]
+    sunrise_value = float(values[sunrise_idx])
+    sunrise_time = times[sunrise_idx]
+    peak_value = float(values[peak_idx])
+    peak_time = times[peak_idx]
 
-        # Rise is the key solar indicator: morning-to-afternoon charge
-        rise = peak_value - sunrise_value
+    # Rise is the key solar indicator: morning-to-afternoon charge
+    rise = peak_value - sunrise_value
 
-        # Find the last reading of the day as "sunset" for display
-        sunset_value = values[-1]["value"]
-        sunset_time = values[-1]["time"]
-        fall = peak_value - sunset_value
-    else:
-        # Fallback: use overall min/max with time constraints
-        peak_idx = max(range(len(values)), key=lambda i: values[i]["value"])
-        peak_value = values[peak_idx]["value"]
-        peak_time = values[peak_idx]["time"]
-
-        # Find lowest value before peak as sunrise
-        sunrise_idx = 0
-        min_before_peak = float("inf")
-        for i in range(peak_idx + 1):
-            if values[i]["value"] < min_before_peak:
-                min_before_peak = values[i]["value"]
-                sunrise_idx = i
-
-        sunrise_time = values[sunrise_idx]["time"]
-        sunrise_value = values[sunrise_idx]["value"]
-        sunset_value = values[-1]["value"]
-        sunset_time = values[-1]["time"]
-        rise = peak_value - sunrise_value
-        fall = peak_value - sunset_value
+    # Find the last reading of the day as "sunset" for display
+    sunset_value = float(values[-1])
+    sunset_time = times[-1]
+    fall = peak_value - sunset_value
 
     # Check for solar pattern
     if is_high_efficiency_candidate:
@@ -849,10 +1058,11 @@ def _analyze_metric_for_solar_patterns(
         min_rise_threshold = max(min_variance, daily_range * 0.3)
         min_ratio = 0.95
 
+    peak_hour = hours[peak_idx]
     has_solar_pattern = (
         rise >= min_rise_threshold and
-        peak_time.hour >= 10 and peak_time.hour <= 18 and
-        sunrise_time.hour <= 12 and
+        peak_hour >= 10 and peak_hour <= 18 and
+        hours[sunrise_idx] <= 12 and
         sunrise_value <= peak_value * min_ratio
     )
 
@@ -864,11 +1074,11 @@ def _analyze_metric_for_solar_patterns(
     effective_peak_value = peak_value
     if is_battery:
         # Find if battery hits 100% between sunrise and sunset
-        for v in values:
-            if v["time"] > sunrise_time and v["time"] <= sunset_time and v["value"] >= 100:
-                effective_peak_time = v["time"]
-                effective_peak_value = v["value"]
-                break
+        after_sunrise = bisect_right(times, sunrise_time)
+        full_idx = np.flatnonzero(values[after_sunrise:] >= 100)
+        if full_idx.size:
+            effective_peak_time = times[after_sunrise + full_idx[0]]
+            effective_peak_value = float(values[after_sunrise + full_idx[0]])
 
     charging_hours = (effective_peak_time - sunrise_time).total_seconds() / 3600
     charge_rate = (effective_peak_value - sunrise_value) / charging_hours if charging_hours >= min_hours_for_rate else None
@@ -902,12 +1112,360 @@ def _analyze_metric_for_solar_patterns(
     }
 
 
-@router.get("/analysis/solar-nodes")
+def _solar_node_candidates(cutoff: datetime) -> CompoundSelect:
+    """Node numbers worth a full solar analysis, from the solar_daily view.
+
+    A day only counts toward a node's solar score if one metric has at least
+    3 readings and varies by the analyzer's minimum range (2% battery, 0.05V
+    voltage, 0.01V INA), so nodes without such a day are skipped. The view is
+    refreshed daily; nodes with readings since its newest (possibly partial)
+    day are always kept so recent data is never missed.
+    """
+    min_range = case(
+        (solar_daily.c.metric == "battery", 2),
+        (solar_daily.c.metric == "voltage", 0.05),
+        else_=0.01,
+    )
+    varying_nodes = select(solar_daily.c.node_num).where(
+        solar_daily.c.day >= cutoff.replace(hour=0, minute=0, second=0, microsecond=0),
+        solar_daily.c.readings >= 3,
+        solar_daily.c.max_value - solar_daily.c.min_value >= min_range,
+    )
+    summarized_until = func.coalesce(select(func.max(solar_daily.c.day)).scalar_subquery(), cutoff)
+    recent_nodes = select(Telemetry.node_num).where(Telemetry.received_at >= summarized_until)
+    return union(varying_nodes, recent_nodes)
+
+
+def _hh_mm(time: datetime) -> str:
+    """Format a time as HH:MM without going through strftime."""
+    return f"{time.hour:02d}:{time.minute:02d}"
+
+
+def _format_daily_pattern(date_str: str, result: dict, digits: int) -> dict:
+    """Format one day's solar analysis result for the response.
+
+    Values are rounded to ``digits`` places and rates to one more. Only the
+    few patterns actually returned are formatted, not every analyzed day.
+    """
+    return {
+        "date": date_str,
+        "sunrise": {
+            "time": _hh_mm(result["sunrise"]["time"]),
+            "value": round(result["sunrise"]["value"], digits),
+        },
+        "peak": {
+            "time": _hh_mm(result["peak"]["time"]),
+            "value": round(result["peak"]["value"], digits),
+        },
+        "sunset": {
+            "time": _hh_mm(result["sunset"]["time"]),
+            "value": round(result["sunset"]["value"], digits),
+        },
+        "rise": round(result["rise"], digits) if result["rise"] is not None else None,
+        "fall": round(result["fall"], digits) if result["fall"] is not None else None,
+        "charge_rate_per_hour": round(result["charge_rate"], digits + 1) if result["charge_rate"] is not None else None,
+        "discharge_rate_per_hour": round(result["discharge_rate"], digits + 1) if result["discharge_rate"] is not None else None,
+    }
+
+
+# Series per metric: (times, day ordinals, UTC hours, values), time-ordered
+SolarSeries = dict[str, tuple[list[datetime], list[int], list[int], list[float]]]
+
+# Minimum daily range for a non-pattern day to still count toward total_days
+_SOLAR_MIN_DAY_RANGE = {"battery": 2, "voltage": 0.05}
+_INA_MIN_DAY_RANGE = 0.01  # INA sensors can have smaller variance
+
+
+# solar_daily is created empty and filled by the retention job's first
+# refresh; once populated it stays populated, so only True is cached.
+_solar_daily_ready_cache = TTLCache(ttl=300, maxsize=1)
+
+
+async def _solar_daily_ready(db: AsyncSession) -> bool:
+    """Whether the solar_daily view has been populated and can be queried."""
+    if _solar_daily_ready_cache.get("ready"):
+        return True
+    ready = bool(
+        (
+            await db.execute(
+                text("SELECT ispopulated FROM pg_matviews WHERE matviewname = 'solar_daily'")
+            )
+        ).scalar()
+    )
+    if ready:
+        _solar_daily_ready_cache.set("ready", True)
+    return ready
+
+
+def _solar_telemetry_stmt(cutoff: datetime, prefilter: bool = True) -> Select:
+    """Battery, voltage and INA voltage readings since cutoff, per node oldest first.
+
+    Only the columns the analysis reads are selected, so rows arrive as plain
+    tuples instead of hydrated Telemetry entities. With prefilter, nodes
+    whose days never vary enough to show a pattern are skipped via the
+    solar_daily view; pass False while the view is still unpopulated.
+    Ordering by (node_num, received_at) matches ix_telemetry_node_received
+    and delivers each node's readings as one contiguous, time-sorted run.
+    """
+    stmt = (
+        select(
+            Telemetry.node_num,
+            Telemetry.received_at,
+            Telemetry.battery_level,
+            Telemetry.voltage,
+            Telemetry.metric_name,
+            Telemetry.raw_value,
+            _utc_hour(Telemetry.received_at),
+        )
+        .where(Telemetry.received_at >= cutoff)
+        .where(_solar_reading_filter())
+        .order_by(Telemetry.node_num.asc(), Telemetry.received_at.asc())
+        .execution_options(yield_per=1000)
+    )
+    if prefilter:
+        stmt = stmt.where(Telemetry.node_num.in_(_solar_node_candidates(cutoff)))
+    return stmt
+
+
+def _solar_reading_filter() -> ColumnElement[bool]:
+    """Telemetry rows carrying a battery, voltage or INA voltage reading."""
+    return (
+        (Telemetry.battery_level.isnot(None)) |
+        (Telemetry.voltage.isnot(None)) |
+        (Telemetry.metric_name.like("%Voltage"))  # INA sensor voltage channels
+    )
+
+
+def _solar_reporting_nodes_stmt(cutoff: datetime) -> Select:
+    """Number of nodes with battery, voltage or INA voltage readings since cutoff.
+
+    This is the total_nodes_analyzed count, including nodes the solar_daily
+    prefilter skipped because they never varied enough to analyze.
+    """
+    return (
+        select(func.count(distinct(Telemetry.node_num)))
+        .where(Telemetry.received_at >= cutoff)
+        .where(_solar_reading_filter())
+    )
+
+
+def _add_solar_readings(series: SolarSeries, row: Row) -> None:
+    """Append one _solar_telemetry_stmt row's battery, voltage and INA voltage readings."""
+    received_at = row.received_at
+    # Integer day ordinals are cheaper to build, hash and sort than date strings
+    day = received_at.toordinal()
+    hour = int(row.hour)
+    readings = [("battery", row.battery_level), ("voltage", row.voltage)]
+    # INA sensors report voltage as ch1Voltage, ch2Voltage, ch3Voltage with value in raw_value
+    metric_name = row.metric_name
+    if metric_name and metric_name.endswith("Voltage") and metric_name != "voltage":
+        readings.append((metric_name, row.raw_value))
+    for metric, value in readings:
+        if value is not None:
+            times, days, hours, values = series.setdefault(metric, ([], [], [], []))
+            times.append(received_at)
+            days.append(day)
+            hours.append(hour)
+            values.append(value)
+
+
+def _solar_metric_stats(
+    metric: str,
+    times: list[datetime],
+    days: list[int],
+    hours: list[int],
+    values: list[float],
+) -> dict:
+    """Run the per-day solar pattern analysis over one metric's readings.
+
+    Readings are converted to arrays once and each day is a slice between
+    the boundaries np.unique finds in the (time-ordered) day ordinals.
+    """
+    is_battery = metric == "battery"
+    min_day_range = _SOLAR_MIN_DAY_RANGE.get(metric, _INA_MIN_DAY_RANGE)
+    stats = {
+        "days_with_pattern": 0,
+        "total_days": 0,
+        "high_efficiency_days": 0,
+        "daily_patterns": [],  # (day ordinal, analysis result)
+        "charge_rates": array("d"),
+        "discharge_rates": array("d"),
+        "charging_hours_list": [],
+        "discharge_hours_list": [],
+        "total_variance": 0,  # Sum of daily ranges to pick best metric
+    }
+    previous_day_sunset = None
+
+    hours_array = np.asarray(hours, dtype=np.int8)
+    values_array = np.asarray(values, dtype=np.float64)
+    day_keys, starts = np.unique(np.asarray(days), return_index=True)
+    ends = [*starts[1:].tolist(), len(values)]
+
+    for day_key, lo, hi in zip(day_keys.tolist(), starts.tolist(), ends, strict=True):
+        if hi - lo < 3:  # Need at least 3 readings to detect a pattern
+            continue
+        day_values = values_array[lo:hi]
+        result = _analyze_metric_for_solar_patterns(
+            times[lo:hi], hours_array[lo:hi], day_values, is_battery, previous_day_sunset
+        )
+        if result:
+            stats["days_with_pattern"] += 1
+            if result["charge_rate"] is not None:
+                stats["charge_rates"].append(result["charge_rate"])
+            if result["discharge_rate"] is not None:
+                stats["discharge_rates"].append(result["discharge_rate"])
+            if result["daylight_hours"]:
+                stats["charging_hours_list"].append(result["daylight_hours"])
+            if result["discharge_hours"]:
+                stats["discharge_hours_list"].append(result["discharge_hours"])
+            stats["total_variance"] += result["daily_range"]
+            if result["is_high_efficiency"]:
+                stats["high_efficiency_days"] += 1
+            stats["daily_patterns"].append((day_key, result))
+            # Track sunset for next day's discharge calculation
+            previous_day_sunset = result["sunset"]
+            stats["total_days"] += 1
+        elif np.ptp(day_values) >= min_day_range:
+            # Day analyzed but no pattern - still counts if it had enough variance
+            stats["total_days"] += 1
+
+    return stats
+
+
+def _solar_metrics(metric_stats: dict[str, dict]) -> list[str]:
+    """Metrics showing solar patterns on enough days, battery and voltage first."""
+    solar = []
+    for metric, stats in metric_stats.items():
+        if stats["total_days"] >= 2:
+            is_mostly_high_eff = stats["high_efficiency_days"] > stats["total_days"] * 0.5
+            min_ratio = 0.33 if is_mostly_high_eff else 0.5
+            if stats["days_with_pattern"] / stats["total_days"] >= min_ratio:
+                solar.append(metric)
+    order = {"battery": 0, "voltage": 1}
+    return sorted(solar, key=lambda metric: order.get(metric, 2))
+
+
+def _choose_solar_metric(metric_stats: dict[str, dict], solar_metrics: list[str]) -> str:
+    """Pick the solar metric with the most normalized variance.
+
+    Prefers the metric that shows more variation (avoids stuck-at-100%
+    battery). Voltage and INA ranges are scaled so a 0.3V swing compares
+    with a 10% battery swing; with no variance the first metric wins.
+    """
+    chosen = solar_metrics[0]
+    best_variance = 0
+    for metric in solar_metrics:
+        variance = metric_stats[metric]["total_variance"]
+        if metric != "battery":
+            variance *= 100 / 5
+        if variance > best_variance:
+            best_variance = variance
+            chosen = metric
+    return chosen
+
+
+def _analyze_solar_node(series: SolarSeries) -> tuple[dict | None, list[float], list[float]]:
+    """Analyze one node's metric series for solar patterns.
+
+    Pure and independent of other nodes, so it can run in a worker process.
+
+    Returns:
+        (candidate, charging_hours, discharge_hours) where candidate is the
+        solar-node entry without node_num/node_name, or None if the node does
+        not look solar-powered, and the hour lists feed the global averages.
+    """
+    metric_stats = {metric: _solar_metric_stats(metric, *columns) for metric, columns in series.items()}
+
+    all_charging_hours = []  # Hours between sunrise and sunset (daylight/charging period)
+    all_discharge_hours = []  # Hours between sunset and next sunrise (overnight/discharge period)
+    for stats in metric_stats.values():
+        all_charging_hours.extend(stats["charging_hours_list"])
+        all_discharge_hours.extend(stats["discharge_hours_list"])
+
+    # Node is solar if ANY metric shows patterns (battery, voltage, or INA channel)
+    metrics_detected = _solar_metrics(metric_stats)
+    if not metrics_detected:
+        return None, all_charging_hours, all_discharge_hours
+
+    metric_type = _choose_solar_metric(metric_stats, metrics_detected)
+    chosen_stats = metric_stats[metric_type]
+
+    # Calculate solar score from the best metric
+    total_days = chosen_stats["total_days"]
+    days_with_pattern = chosen_stats["days_with_pattern"]
+    solar_score = round((days_with_pattern / total_days) * 100, 1) if total_days > 0 else 0
+
+    # Chart data for the chosen metric; the series is already chronological.
+    # round() keeps integer battery levels as ints.
+    times, _, _, values = series[metric_type]
+    all_chart_data = [
+        {"timestamp": int(t.timestamp() * 1000), "value": round(v, 3)}
+        for t, v in zip(times, values, strict=True)
+    ]
+
+    # Calculate average rates from chosen metric (None rates are never recorded)
+    charge_rates = chosen_stats["charge_rates"]
+    discharge_rates = chosen_stats["discharge_rates"]
+    avg_charge_rate = round(sum(charge_rates) / len(charge_rates), 2) if charge_rates else None
+    avg_discharge_rate = round(sum(discharge_rates) / len(discharge_rates), 2) if discharge_rates else None
+
+    digits = 1 if metric_type in ("battery", "voltage") else 3
+    candidate = {
+        "solar_score": solar_score,
+        "days_analyzed": total_days,
+        "days_with_pattern": days_with_pattern,
+        "recent_patterns": [
+            _format_daily_pattern(date.fromordinal(day_key).isoformat(), result, digits)
+            for day_key, result in chosen_stats["daily_patterns"][-3:]
+        ],
+        "metric_type": metric_type,
+        "metrics_detected": metrics_detected,
+        "chart_data": all_chart_data,
+        "avg_charge_rate_per_hour": avg_charge_rate,
+        "avg_discharge_rate_per_hour": avg_discharge_rate,
+    }
+    return candidate, all_charging_hours, all_discharge_hours
+
+
+# A few workers are enough to keep long lookbacks off the event loop
+# without competing with the API process for every core.
+_SOLAR_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+@cache
+def _solar_analysis_pool() -> ProcessPoolExecutor:
+    """Worker processes for long solar-node lookbacks, started on first use.
+
+    Workers are spawned rather than forked so they never inherit the running
+    event loop, database pool or collector threads of the API process.
+    """
+    return ProcessPoolExecutor(
+        max_workers=_SOLAR_POOL_MAX_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_solar_analysis_pool() -> None:
+    """Stop the solar analysis workers if they were started."""
+    if _solar_analysis_pool.cache_info().currsize:
+        _solar_analysis_pool().shutdown(cancel_futures=True)
+        _solar_analysis_pool.cache_clear()
+
+
+# Shorter lookbacks are analyzed inline; pickling readings to workers would
+# cost more than the analysis itself.
+_SOLAR_POOL_MIN_DAYS = 14
+
+
+_solar_nodes_cache = TTLCache(ttl=300)
+
+
+@router.get("/analysis/solar-nodes", response_class=ORJSONResponse)
 async def identify_solar_nodes(
     db: AsyncSession = Depends(get_db),
     lookback_days: int = Query(default=7, ge=1, le=90, description="Days of history to analyze"),
     _access: None = Depends(require_tab_access("analysis")),
-) -> dict:
+) -> ORJSONResponse:
     """Analyze telemetry to identify nodes that are likely solar-powered.
 
     Examines battery_level and voltage patterns over time to identify
@@ -916,413 +1474,60 @@ async def identify_solar_nodes(
     - Falling values during night hours (peak to next sunrise)
 
     Returns a list of nodes with their solar score and daily patterns.
+    Daily patterns move slowly, so responses are cached per lookback_days
+    for a few minutes.
     """
-    from collections import defaultdict
 
-    cutoff = datetime.now(UTC) - timedelta(days=lookback_days)
+    cached = _solar_nodes_cache.get(lookback_days)
+    if cached is not None:
+        return ORJSONResponse(cached)
 
-    # Fetch all battery_level, voltage, and INA voltage telemetry for the period
-    # INA sensors report voltage as ch1Voltage, ch2Voltage, ch3Voltage with value in raw_value
-    result = await db.execute(
-        select(Telemetry, Source.name.label("source_name"))
-        .join(Source)
-        .where(Telemetry.received_at >= cutoff)
-        .where(
-            (Telemetry.battery_level.isnot(None)) |
-            (Telemetry.voltage.isnot(None)) |
-            (Telemetry.metric_name.like("%Voltage"))  # INA sensor voltage channels
-        )
-        .order_by(Telemetry.received_at.asc())
-    )
-    rows = result.all()
+    cutoff = datetime.now(UTC) - timedelta(days=lookback_days)
 
-    # Get node names for display
-    node_result = await db.execute(select(Node))
-    nodes = node_result.scalars().all()
-    node_names: dict[int, str] = {}
-    for node in nodes:
-        if node.long_name:
-            node_names[node.node_num] = node.long_name
-        elif node.short_name:
-            node_names[node.node_num] = node.short_name
-        else:
-            node_names[node.node_num] = f"!{node.node_num:08x}"
-
-    # Group data by node_num and date
-    # Structure: {node_num: {date: [{"time": datetime, "battery": val, "voltage": val, "ina_voltages": {}}]}}
-    node_data: dict[int, dict[str, list[dict]]] = defaultdict(lambda: defaultdict(list))
-
-    for telemetry, source_name in rows:
-        date_str = telemetry.received_at.strftime("%Y-%m-%d")
-
-        # Extract INA voltage from metric_name pattern (ch1Voltage, ch2Voltage, ch3Voltage)
-        ina_voltages: dict[str, float] = {}
-        if telemetry.metric_name and telemetry.metric_name.endswith("Voltage") and telemetry.metric_name != "voltage":
-            # This is an INA voltage channel (e.g., ch1Voltage, ch2Voltage, ch3Voltage)
-            ina_voltages[telemetry.metric_name] = telemetry.raw_value
-
-        node_data[telemetry.node_num][date_str].append({
-            "time": telemetry.received_at,
-            "battery": telemetry.battery_level,
-            "voltage": telemetry.voltage,
-            "ina_voltages": ina_voltages,
-        })
+    # Rows are streamed in batches and grouped as they arrive.
+    prefilter = await _solar_daily_ready(db)
+    result = await db.stream(_solar_telemetry_stmt(cutoff, prefilter))
+
+    # Group readings by node and metric as (times, days, hours, values) columns;
+    # rows arrive grouped by node, so the series is only looked up per run
+    node_series: dict[int, SolarSeries] = {}
+    node_num = series = None
+
+    async for row in result:
+        if row.node_num != node_num:
+            node_num = row.node_num
+            series = node_series.setdefault(node_num, {})
+        _add_solar_readings(series, row)
+
+    # Get display names only for nodes that reported battery/voltage data
+    node_names = await _node_display_names(db, node_series.keys())
+
+    # Analyze each node's daily patterns. Nodes are independent, so long
+    # lookbacks fan out across worker processes to sidestep the GIL.
+    if lookback_days >= _SOLAR_POOL_MIN_DAYS and len(node_series) > 1:
+        loop = asyncio.get_running_loop()
+        pool = _solar_analysis_pool()
+        node_results = await asyncio.gather(*(
+            loop.run_in_executor(pool, _analyze_solar_node, series)
+            for series in node_series.values()
+        ))
+    else:
+        node_results = [_analyze_solar_node(series) for series in node_series.values()]
 
-    # Analyze each node's daily patterns
     solar_candidates = []
 
     # Global tracking for average hours calculations
     all_charging_hours = []  # Hours between sunrise and sunset (daylight/charging period)
     all_discharge_hours = []  # Hours between sunset and next sunrise (overnight/discharge period)
 
-    for node_num, daily_data in node_data.items():
-        # Track patterns independently for battery and voltage
-        battery_stats = {
-            "days_with_pattern": 0,
-            "total_days": 0,
-            "high_efficiency_days": 0,
-            "daily_patterns": [],
-            "charge_rates": [],
-            "discharge_rates": [],
-            "previous_day_sunset": None,
-            "total_variance": 0,  # Sum of daily ranges to pick best metric
-        }
-        voltage_stats = {
-            "days_with_pattern": 0,
-            "total_days": 0,
-            "high_efficiency_days": 0,
-            "daily_patterns": [],
-            "charge_rates": [],
-            "discharge_rates": [],
-            "previous_day_sunset": None,
-            "total_variance": 0,
-        }
-
-        # Track INA voltage channels dynamically (ch1Voltage, ch2Voltage, ch3Voltage, etc.)
-        ina_channel_stats: dict[str, dict] = {}
-
-        # First pass: identify all INA channels present for this node
-        ina_channels_seen: set[str] = set()
-        for readings in daily_data.values():
-            for r in readings:
-                for channel_name in r.get("ina_voltages", {}).keys():
-                    ina_channels_seen.add(channel_name)
-
-        # Initialize stats for each INA channel
-        for channel_name in ina_channels_seen:
-            ina_channel_stats[channel_name] = {
-                "days_with_pattern": 0,
-                "total_days": 0,
-                "high_efficiency_days": 0,
-                "daily_patterns": [],
-                "charge_rates": [],
-                "discharge_rates": [],
-                "previous_day_sunset": None,
-                "total_variance": 0,
-            }
-
-        # Sort dates to process in chronological order for discharge calculation
-        sorted_dates = sorted(daily_data.keys())
-
-        for date_str in sorted_dates:
-            readings = daily_data[date_str]
-            if len(readings) < 3:  # Need at least 3 readings to detect a pattern
-                continue
-
-            # Sort by time
-            readings.sort(key=lambda x: x["time"])
-
-            # Separate battery, voltage, and INA voltage readings
-            battery_values = []
-            voltage_values = []
-            ina_channel_values: dict[str, list[dict]] = {ch: [] for ch in ina_channels_seen}
-
-            for r in readings:
-                if r["battery"] is not None:
-                    battery_values.append({"time": r["time"], "value": r["battery"]})
-                if r["voltage"] is not None:
-                    voltage_values.append({"time": r["time"], "value": r["voltage"]})
-                # Collect INA voltage values
-                for channel_name, value in r.get("ina_voltages", {}).items():
-                    if value is not None:
-                        ina_channel_values[channel_name].append({"time": r["time"], "value": value})
-
-            # Analyze battery independently
-            if len(battery_values) >= 3:
-                battery_result = _analyze_metric_for_solar_patterns(
-                    battery_values, is_battery=True, previous_day_sunset=battery_stats["previous_day_sunset"]
-                )
-                if battery_result:
-                    battery_stats["days_with_pattern"] += 1
-                    battery_stats["charge_rates"].append(battery_result["charge_rate"])
-                    if battery_result["discharge_rate"] is not None:
-                        battery_stats["discharge_rates"].append(battery_result["discharge_rate"])
-                    if battery_result["daylight_hours"]:
-                        all_charging_hours.append(battery_result["daylight_hours"])
-                    if battery_result["discharge_hours"]:
-                        all_discharge_hours.append(battery_result["discharge_hours"])
-                    battery_stats["total_variance"] += battery_result["daily_range"]
-                    if battery_result["is_high_efficiency"]:
-                        battery_stats["high_efficiency_days"] += 1
-                    battery_stats["daily_patterns"].append({
-                        "date": date_str,
-                        "sunrise": {
-                            "time": battery_result["sunrise"]["time"].strftime("%H:%M"),
-                            "value": round(battery_result["sunrise"]["value"], 1),
-                        },
-                        "peak": {
-                            "time": battery_result["peak"]["time"].strftime("%H:%M"),
-                            "value": round(battery_result["peak"]["value"], 1),
-                        },
-                        "sunset": {
-                            "time": battery_result["sunset"]["time"].strftime("%H:%M"),
-                            "value": round(battery_result["sunset"]["value"], 1),
-                        },
-                        "rise": round(battery_result["rise"], 1) if battery_result["rise"] is not None else None,
-                        "fall": round(battery_result["fall"], 1) if battery_result["fall"] is not None else None,
-                        "charge_rate_per_hour": round(battery_result["charge_rate"], 2) if battery_result["charge_rate"] is not None else None,
-                        "discharge_rate_per_hour": round(battery_result["discharge_rate"], 2) if battery_result["discharge_rate"] is not None else None,
-                    })
-                    # Track sunset for next day's discharge calculation
-                    battery_stats["previous_day_sunset"] = {
-                        "time": battery_result["sunset"]["time"],
-                        "value": battery_result["sunset"]["value"],
-                    }
-                    battery_stats["total_days"] += 1
-                elif battery_values:
-                    # Day analyzed but no pattern - still count for total_days if variance check passed
-                    all_vals = [v["value"] for v in battery_values]
-                    daily_range = max(all_vals) - min(all_vals)
-                    if daily_range >= 2:  # Had enough variance to consider
-                        battery_stats["total_days"] += 1
-
-            # Analyze voltage independently
-            if len(voltage_values) >= 3:
-                voltage_result = _analyze_metric_for_solar_patterns(
-                    voltage_values, is_battery=False, previous_day_sunset=voltage_stats["previous_day_sunset"]
-                )
-                if voltage_result:
-                    voltage_stats["days_with_pattern"] += 1
-                    voltage_stats["charge_rates"].append(voltage_result["charge_rate"])
-                    if voltage_result["discharge_rate"] is not None:
-                        voltage_stats["discharge_rates"].append(voltage_result["discharge_rate"])
-                    if voltage_result["daylight_hours"]:
-                        all_charging_hours.append(voltage_result["daylight_hours"])
-                    if voltage_result["discharge_hours"]:
-                        all_discharge_hours.append(voltage_result["discharge_hours"])
-                    voltage_stats["total_variance"] += voltage_result["daily_range"]
-                    if voltage_result["is_high_efficiency"]:
-                        voltage_stats["high_efficiency_days"] += 1
-                    voltage_stats["daily_patterns"].append({
-                        "date": date_str,
-                        "sunrise": {
-                            "time": voltage_result["sunrise"]["time"].strftime("%H:%M"),
-                            "value": round(voltage_result["sunrise"]["value"], 1),
-                        },
-                        "peak": {
-                            "time": voltage_result["peak"]["time"].strftime("%H:%M"),
-                            "value": round(voltage_result["peak"]["value"], 1),
-                        },
-                        "sunset": {
-                            "time": voltage_result["sunset"]["time"].strftime("%H:%M"),
-                            "value": round(voltage_result["sunset"]["value"], 1),
-                        },
-                        "rise": round(voltage_result["rise"], 1) if voltage_result["rise"] is not None else None,
-                        "fall": round(voltage_result["fall"], 1) if voltage_result["fall"] is not None else None,
-                        "charge_rate_per_hour": round(voltage_result["charge_rate"], 2) if voltage_result["charge_rate"] is not None else None,
-                        "discharge_rate_per_hour": round(voltage_result["discharge_rate"], 2) if voltage_result["discharge_rate"] is not None else None,
-                    })
-                    # Track sunset for next day's discharge calculation
-                    voltage_stats["previous_day_sunset"] = {
-                        "time": voltage_result["sunset"]["time"],
-                        "value": voltage_result["sunset"]["value"],
-                    }
-                    voltage_stats["total_days"] += 1
-                elif voltage_values:
-                    # Day analyzed but no pattern
-                    all_vals = [v["value"] for v in voltage_values]
-                    daily_range = max(all_vals) - min(all_vals)
-                    if daily_range >= 0.05:  # Had enough variance to consider
-                        voltage_stats["total_days"] += 1
-
-            # Analyze each INA voltage channel independently
-            for channel_name, channel_values in ina_channel_values.items():
-                if len(channel_values) >= 3:
-                    stats = ina_channel_stats[channel_name]
-                    ina_result = _analyze_metric_for_solar_patterns(
-                        channel_values, is_battery=False, previous_day_sunset=stats["previous_day_sunset"]
-                    )
-                    if ina_result:
-                        stats["days_with_pattern"] += 1
-                        stats["charge_rates"].append(ina_result["charge_rate"])
-                        if ina_result["discharge_rate"] is not None:
-                            stats["discharge_rates"].append(ina_result["discharge_rate"])
-                        if ina_result["daylight_hours"]:
-                            all_charging_hours.append(ina_result["daylight_hours"])
-                        if ina_result["discharge_hours"]:
-                            all_discharge_hours.append(ina_result["discharge_hours"])
-                        stats["total_variance"] += ina_result["daily_range"]
-                        if ina_result["is_high_efficiency"]:
-                            stats["high_efficiency_days"] += 1
-                        stats["daily_patterns"].append({
-                            "date": date_str,
-                            "sunrise": {
-                                "time": ina_result["sunrise"]["time"].strftime("%H:%M"),
-                                "value": round(ina_result["sunrise"]["value"], 3),
-                            },
-                            "peak": {
-                                "time": ina_result["peak"]["time"].strftime("%H:%M"),
-                                "value": round(ina_result["peak"]["value"], 3),
-                            },
-                            "sunset": {
-                                "time": ina_result["sunset"]["time"].strftime("%H:%M"),
-                                "value": round(ina_result["sunset"]["value"], 3),
-                            },
-                            "rise": round(ina_result["rise"], 3) if ina_result["rise"] is not None else None,
-                            "fall": round(ina_result["fall"], 3) if ina_result["fall"] is not None else None,
-                            "charge_rate_per_hour": round(ina_result["charge_rate"], 4) if ina_result["charge_rate"] is not None else None,
-                            "discharge_rate_per_hour": round(ina_result["discharge_rate"], 4) if ina_result["discharge_rate"] is not None else None,
-                        })
-                        stats["previous_day_sunset"] = {
-                            "time": ina_result["sunset"]["time"],
-                            "value": ina_result["sunset"]["value"],
-                        }
-                        stats["total_days"] += 1
-                    elif channel_values:
-                        all_vals = [v["value"] for v in channel_values]
-                        daily_range = max(all_vals) - min(all_vals)
-                        if daily_range >= 0.01:  # INA sensors can have smaller variance
-                            stats["total_days"] += 1
-
-        # Determine if node is solar-powered based on ANY metric showing patterns
-        # A node is solar if battery, voltage, OR any INA channel shows solar patterns
-        battery_is_solar = False
-        voltage_is_solar = False
-        ina_channels_solar: dict[str, bool] = {}
-
-        # Check battery
-        if battery_stats["total_days"] >= 2:
-            is_mostly_high_eff = battery_stats["high_efficiency_days"] > battery_stats["total_days"] * 0.5
-            min_ratio = 0.33 if is_mostly_high_eff else 0.5
-            if battery_stats["days_with_pattern"] / battery_stats["total_days"] >= min_ratio:
-                battery_is_solar = True
-
-        # Check voltage
-        if voltage_stats["total_days"] >= 2:
-            is_mostly_high_eff = voltage_stats["high_efficiency_days"] > voltage_stats["total_days"] * 0.5
-            min_ratio = 0.33 if is_mostly_high_eff else 0.5
-            if voltage_stats["days_with_pattern"] / voltage_stats["total_days"] >= min_ratio:
-                voltage_is_solar = True
-
-        # Check INA voltage channels
-        for channel_name, stats in ina_channel_stats.items():
-            if stats["total_days"] >= 2:
-                is_mostly_high_eff = stats["high_efficiency_days"] > stats["total_days"] * 0.5
-                min_ratio = 0.33 if is_mostly_high_eff else 0.5
-                if stats["days_with_pattern"] / stats["total_days"] >= min_ratio:
-                    ina_channels_solar[channel_name] = True
-
-        # Node is solar if ANY metric shows patterns (battery, voltage, or INA channel)
-        any_ina_solar = any(ina_channels_solar.values())
-        if battery_is_solar or voltage_is_solar or any_ina_solar:
-            # Choose the best metric for charting based on variance
-            # Prefer the metric that shows more variation (avoids stuck-at-100% battery)
-            # Consider battery, voltage, and INA channels
-            chosen_stats = None
-            metric_type = None
-            best_variance = 0
-
-            # Collect all solar metrics with their normalized variance
-            metric_candidates = []
-            if battery_is_solar:
-                # Battery variance is already in % (0-100)
-                metric_candidates.append(("battery", battery_stats, battery_stats["total_variance"]))
-            if voltage_is_solar:
-                # Normalize voltage variance: 0.3V swing ~ 10% battery swing
-                normalized = voltage_stats["total_variance"] * (100 / 5)
-                metric_candidates.append(("voltage", voltage_stats, normalized))
-            for channel_name, is_solar in ina_channels_solar.items():
-                if is_solar:
-                    stats = ina_channel_stats[channel_name]
-                    # Normalize INA voltage variance similar to device voltage
-                    normalized = stats["total_variance"] * (100 / 5)
-                    metric_candidates.append((channel_name, stats, normalized))
-
-            # Pick the metric with highest normalized variance
-            for name, stats, variance in metric_candidates:
-                if variance > best_variance:
-                    best_variance = variance
-                    chosen_stats = stats
-                    metric_type = name
-
-            # Fallback to battery if no variance comparison possible
-            if chosen_stats is None:
-                if battery_is_solar:
-                    chosen_stats = battery_stats
-                    metric_type = "battery"
-                elif voltage_is_solar:
-                    chosen_stats = voltage_stats
-                    metric_type = "voltage"
-                elif ina_channels_solar:
-                    # Pick first INA channel that's solar
-                    for channel_name, is_solar in ina_channels_solar.items():
-                        if is_solar:
-                            chosen_stats = ina_channel_stats[channel_name]
-                            metric_type = channel_name
-                            break
-
-            # Calculate solar score from the best metric
-            total_days = chosen_stats["total_days"]
-            days_with_pattern = chosen_stats["days_with_pattern"]
-            solar_score = round((days_with_pattern / total_days) * 100, 1) if total_days > 0 else 0
-
-            # Collect chart data for the chosen metric
-            all_chart_data = []
-            for date_str, readings in daily_data.items():
-                for r in readings:
-                    if metric_type == "battery":
-                        value = r["battery"]
-                    elif metric_type == "voltage":
-                        value = r["voltage"]
-                    else:
-                        # INA channel - get from ina_voltages dict
-                        value = r.get("ina_voltages", {}).get(metric_type)
-                    if value is not None:
-                        all_chart_data.append({
-                            "timestamp": int(r["time"].timestamp() * 1000),
-                            "value": round(value, 3),
-                        })
-            all_chart_data.sort(key=lambda x: x["timestamp"])
-
-            # Calculate average rates from chosen metric (filter None values)
-            charge_rates = [r for r in chosen_stats["charge_rates"] if r is not None]
-            discharge_rates = [r for r in chosen_stats["discharge_rates"] if r is not None]
-            avg_charge_rate = round(sum(charge_rates) / len(charge_rates), 2) if charge_rates else None
-            avg_discharge_rate = round(sum(discharge_rates) / len(discharge_rates), 2) if discharge_rates else None
-
-            # Indicate which metrics showed solar patterns
-            metrics_detected = []
-            if battery_is_solar:
-                metrics_detected.append("battery")
-            if voltage_is_solar:
-                metrics_detected.append("voltage")
-            # Add INA channels that showed patterns
-            for channel_name, is_solar in ina_channels_solar.items():
-                if is_solar:
-                    metrics_detected.append(channel_name)
-
+    for node_num, (candidate, charging_hours, discharge_hours) in zip(node_series, node_results, strict=True):
+        all_charging_hours.extend(charging_hours)
+        all_discharge_hours.extend(discharge_hours)
+        if candidate is not None:
             solar_candidates.append({
                 "node_num": node_num,
-                "node_name": node_names.get(node_num, f"!{node_num:08x}"),
-                "solar_score": solar_score,
-                "days_analyzed": total_days,
-                "days_with_pattern": days_with_pattern,
-                "recent_patterns": chosen_stats["daily_patterns"][-3:],
-                "metric_type": metric_type,
-                "metrics_detected": metrics_detected,
-                "chart_data": all_chart_data,
-                "avg_charge_rate_per_hour": avg_charge_rate,
-                "avg_discharge_rate_per_hour": avg_discharge_rate,
+                "node_name": node_names.get(node_num) or _hex_node_id(node_num),
+                **candidate,
             })
 
     # Sort by solar score descending
@@ -1330,21 +1535,11 @@ async def identify_solar_nodes(
 
     # Fetch solar production data for the lookback period (for chart overlay)
     # Group by hour and average watt_hours across sources
-    hour_trunc = func.date_trunc("hour", SolarProduction.timestamp)
-    solar_result = await db.execute(
-        select(
-            hour_trunc.label("hour"),
-            func.avg(SolarProduction.watt_hours).label("avg_watt_hours"),
-        )
-        .where(SolarProduction.timestamp >= cutoff)
-        .group_by(literal_column("1"))
-        .order_by(literal_column("1").asc())
-    )
-    solar_rows = solar_result.all()
+    solar_rows = await _hourly_solar_production(db, lookback_days * 24)
     solar_chart_data = [
         {
-            "timestamp": int(row.hour.timestamp() * 1000),
-            "wattHours": round(row.avg_watt_hours, 2),
+            "timestamp": row.timestamp,
+            "wattHours": row.watt_hours,
         }
         for row in solar_rows
     ]
@@ -1384,23 +1579,221 @@ async def identify_solar_nodes(
         else:
             node["insufficient_solar"] = None  # Unknown - insufficient data
 
-    return {
+    # Prefiltered nodes were never streamed, but they still count as analyzed
+    if prefilter:
+        total_nodes_analyzed = await db.scalar(_solar_reporting_nodes_stmt(cutoff))
+    else:
+        total_nodes_analyzed = len(node_series)
+
+    body = orjson.dumps({
         "lookback_days": lookback_days,
-        "total_nodes_analyzed": len(node_data),
+        "total_nodes_analyzed": total_nodes_analyzed,
         "solar_nodes_count": len(solar_candidates),
         "solar_nodes": solar_candidates,
         "solar_production": solar_chart_data,
         "avg_charging_hours_per_day": avg_charging_hours_per_day,
         "avg_discharge_hours_per_day": avg_discharge_hours_per_day,
-    }
+    })
+    _solar_nodes_cache.set(lookback_days, body)
+    return ORJSONResponse(body)
+
+
+@dataclass(frozen=True)
+class _ForecastDay:
+    """Per-day inputs to the battery simulation, shared by every solar node."""
+
+    date: str
+    factor: float  # forecast output relative to the historical average
+    sunrise: datetime  # 12:00 UTC = ~7am EST
+    peak: datetime  # 19:00 UTC = ~2pm EST
+    sunset: datetime  # 23:00 UTC = ~6pm EST
+    sunrise_timestamp: str
+    peak_timestamp: str
+    sunset_timestamp: str
+
+
+def _forecast_schedule(forecast_days: list[dict]) -> list[_ForecastDay]:
+    """Resolve each forecast day's phase times and charge factor once."""
+    schedule = []
+    for day_forecast in forecast_days:
+        day_date = day_forecast["date"]
+        day_start = datetime.fromisoformat(day_date).replace(tzinfo=UTC)
+        pct_of_average = day_forecast["pct_of_average"]
+        schedule.append(_ForecastDay(
+            date=day_date,
+            factor=pct_of_average / 100 if pct_of_average > 0 else 0.5,
+            sunrise=day_start.replace(hour=12),
+            peak=day_start.replace(hour=19),
+            sunset=day_start.replace(hour=23),
+            sunrise_timestamp=f"{day_date}T12:00:00Z",
+            peak_timestamp=f"{day_date}T19:00:00Z",
+            sunset_timestamp=f"{day_date}T23:00:00Z",
+        ))
+    return schedule
+
+
+# (timestamp, phase, forecast factor, simulated battery per node)
+SimulationPoint = tuple[str, str, float, np.ndarray]
+
+
+def _simulate_first_forecast_day(
+    now: datetime,
+    day: _ForecastDay,
+    battery: np.ndarray,
+    min_battery: np.ndarray,
+    avg_charge_rate: np.ndarray,
+    avg_discharge_rate: np.ndarray,
+    avg_charging_hours: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, list[SimulationPoint]]:
+    """Simulate the first forecast day, skipping phases that are already past.
+
+    Later forecast days always run every phase in full; only the first day
+    needs to compare each phase against the current time. Every argument
+    after day holds one value per node, and all nodes are stepped together.
+
+    Returns:
+        Tuple of (battery levels, minimum battery levels, simulation points)
+    """
+    forecast_factor = round(day.factor, 2)
+    effective_charge_rate = avg_charge_rate * day.factor
+    sunrise_time, peak_time, sunset_time = day.sunrise, day.peak, day.sunset
+
+    points = []
+
+    # Point 1: Sunrise - discharge only for the hours remaining until sunrise
+    if sunrise_time > now:
+        hours_until_sunrise = (sunrise_time - now).total_seconds() / 3600
+        battery = np.clip(battery - avg_discharge_rate * hours_until_sunrise, 0, 100)
+        min_battery = np.minimum(min_battery, battery)
+        points.append((day.sunrise_timestamp, "sunrise", forecast_factor, battery))
+
+    # Point 2: Peak - partial charge if we're already in the charging phase
+    if peak_time > now:
+        if sunrise_time <= now:
+            hours_charging = (peak_time - now).total_seconds() / 3600
+            battery = battery + effective_charge_rate * hours_charging
+        else:
+            battery = battery + effective_charge_rate * avg_charging_hours
+        battery = np.clip(battery, 0, 100)
+        points.append((day.peak_timestamp, "peak", forecast_factor, battery))
+
+    # Point 3: Sunset - partial afternoon discharge if we're already past peak
+    if sunset_time > now:
+        if peak_time <= now:
+            hours_remaining = (sunset_time - now).total_seconds() / 3600
+            battery = battery - avg_discharge_rate * hours_remaining * 0.3
+        else:
+            battery = battery - avg_discharge_rate * 4 * 0.3
+        battery = np.clip(battery, 0, 100)
+        points.append((day.sunset_timestamp, "sunset", forecast_factor, battery))
+
+    return battery, min_battery, points
+
+
+def _simulate_forecast(
+    now: datetime,
+    schedule: list[_ForecastDay],
+    battery: np.ndarray,
+    avg_charge_rate: np.ndarray,
+    avg_discharge_rate: np.ndarray,
+    avg_charging_hours: np.ndarray,
+    avg_discharge_hours: np.ndarray,
+) -> tuple[np.ndarray, list[SimulationPoint]]:
+    """Simulate battery levels for all solar nodes across the forecast schedule.
+
+    Each phase is one vector operation over the per-node arrays instead of a
+    Python loop per node.
+
+    Returns:
+        Tuple of (minimum battery levels, simulation points)
+    """
+    min_battery = battery
+    if not schedule:
+        return min_battery, []
+
+    # The first day is partially elapsed; only simulate phases still ahead
+    battery, min_battery, points = _simulate_first_forecast_day(
+        now, schedule[0], battery, min_battery, avg_charge_rate, avg_discharge_rate, avg_charging_hours
+    )
+
+    for day in schedule[1:]:
+        # Adjust charge rate based on forecast solar output
+        forecast_factor = round(day.factor, 2)
+        effective_charge_rate = avg_charge_rate * day.factor
+
+        # Point 1: Sunrise (~7am) - battery level after overnight discharge
+        battery = np.clip(battery - avg_discharge_rate * avg_discharge_hours, 0, 100)
+        min_battery = np.minimum(min_battery, battery)
+        points.append((day.sunrise_timestamp, "sunrise", forecast_factor, battery))
 
+        # Point 2: Peak (~2pm) - battery level at max charge
+        battery = np.clip(battery + effective_charge_rate * avg_charging_hours, 0, 100)
+        points.append((day.peak_timestamp, "peak", forecast_factor, battery))
 
-@router.get("/analysis/solar-forecast")
+        # Point 3: Sunset (~6pm) - slight discharge during ~4 afternoon hours
+        battery = np.clip(battery - avg_discharge_rate * 4 * 0.3, 0, 100)
+        points.append((day.sunset_timestamp, "sunset", forecast_factor, battery))
+
+    return min_battery, points
+
+
+def _solar_forecast_inputs(
+    series: SolarSeries, row_days: array
+) -> tuple[str, float, float, float, float, float] | None:
+    """Derive one node's battery simulation inputs from its metric series.
+
+    Pure and independent of other nodes, so it can run in a worker process.
+
+    Returns:
+        (metric_type, last battery level, avg charge rate, avg discharge rate,
+        avg charging hours, avg discharge hours), or None if the node is not
+        solar-powered or has no battery level on an analyzable day.
+    """
+    metric_stats = {metric: _solar_metric_stats(metric, *columns) for metric, columns in series.items()}
+
+    # Track last known battery level (independent of pattern detection),
+    # taken from days with enough readings to be analyzed
+    last_known_battery = None
+    if "battery" in series:
+        _, battery_days, _, battery_values = series["battery"]
+        days, day_counts = np.unique(row_days, return_counts=True)
+        analyzed = np.flatnonzero(np.isin(battery_days, days[day_counts >= 3]))
+        if analyzed.size:
+            last_known_battery = battery_values[analyzed[-1]]
+
+    # Node is solar if ANY metric shows patterns
+    solar_metrics = _solar_metrics(metric_stats)
+    if not solar_metrics or last_known_battery is None:
+        return None
+
+    # Choose which metric's rates to use for simulation
+    chosen_metric_type = _choose_solar_metric(metric_stats, solar_metrics)
+    chosen_stats = metric_stats[chosen_metric_type]
+
+    charge_rates = chosen_stats["charge_rates"]
+    discharge_rates = chosen_stats["discharge_rates"]
+    charging_hours_list = chosen_stats["charging_hours_list"]
+    discharge_hours_list = chosen_stats["discharge_hours_list"]
+    return (
+        chosen_metric_type,
+        last_known_battery,
+        sum(charge_rates) / len(charge_rates) if charge_rates else 0,
+        sum(discharge_rates) / len(discharge_rates) if discharge_rates else 0,
+        sum(charging_hours_list) / len(charging_hours_list) if charging_hours_list else 10,
+        sum(discharge_hours_list) / len(discharge_hours_list) if discharge_hours_list else 14,
+    )
+
+
+_solar_forecast_cache = TTLCache(ttl=300)
+
+
+@router.get("/analysis/solar-forecast", response_class=ORJSONResponse)
 async def analyze_solar_forecast(
     db: AsyncSession = Depends(get_db),
     lookback_days: int = Query(default=7, ge=1, le=90, description="Days of history to analyze"),
+    limit: int | None = Query(default=None, ge=1, le=1000, description="Return only the N lowest at-risk nodes"),
     _access: None = Depends(require_tab_access("analysis")),
-) -> dict:
+) -> ORJSONResponse:
     """Analyze solar forecast and simulate node battery states.
 
     Compares forecast solar production to historical averages and simulates
@@ -1411,10 +1804,19 @@ async def analyze_solar_forecast(
     - low_output_warning: True if forecast output is >25% below historical average
     - nodes_at_risk: List of nodes predicted to drop below 50% battery
     - forecast_vs_historical: Comparison data for display
-    """
-    from collections import defaultdict
 
+    With limit set, nodes_at_risk holds only the lowest-battery nodes while
+    nodes_at_risk_count still counts all of them.
+
+    Responses are cached for a few minutes per lookback_days, limit and UTC
+    hour, so a day rollover never serves yesterday's forecast days.
+    """
     now = datetime.now(UTC)
+    cache_key = (lookback_days, limit, now.replace(minute=0, second=0, microsecond=0))
+    cached = _solar_forecast_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
     cutoff = now - timedelta(days=lookback_days)
 
     # Get historical solar production (past days, not including today's future)
@@ -1435,16 +1837,23 @@ async def analyze_solar_forecast(
         .subquery()
     )
 
-    # Main query: average daily totals across sources
+    # Average daily totals across sources, then across days; days averaging
+    # zero are left out of the historical mean (NULLIF)
+    historical_daily = (
+        select(func.avg(source_daily_totals.c.daily_wh).label("avg_wh"))
+        .group_by(source_daily_totals.c.day)
+        .subquery()
+    )
+    nonzero_daily_wh = func.nullif(historical_daily.c.avg_wh, 0)
     historical_result = await db.execute(
         select(
-            source_daily_totals.c.day,
-            func.avg(source_daily_totals.c.daily_wh).label("avg_wh"),
+            func.count().label("historical_rows"),
+            func.count(nonzero_daily_wh).label("historical_days"),
+            func.avg(nonzero_daily_wh).label("avg_historical_wh"),
         )
-        .group_by(source_daily_totals.c.day)
-        .order_by(source_daily_totals.c.day)
     )
-    historical_rows = historical_result.all()
+    historical_rows, historical_days, avg_historical_daily_wh = historical_result.one()
+    avg_historical_daily_wh = avg_historical_daily_wh or 0
 
     # Get forecast solar production (today and future)
     # Subquery: sum watt_hours per source per day for forecast period
@@ -1459,34 +1868,44 @@ async def analyze_solar_forecast(
         .subquery()
     )
 
-    # Main query: average daily totals across sources
+    # Main query: average daily totals across sources, keyed by date string
     forecast_result = await db.execute(
         select(
-            forecast_source_daily.c.day,
-            func.avg(forecast_source_daily.c.daily_wh).label("avg_wh"),
+            func.to_char(forecast_source_daily.c.day, "YYYY-MM-DD").label("day_str"),
+            func.coalesce(func.avg(forecast_source_daily.c.daily_wh), 0).label("avg_wh"),
         )
         .group_by(forecast_source_daily.c.day)
-        .order_by(forecast_source_daily.c.day)
     )
-    forecast_rows = forecast_result.all()
-
-    # Calculate historical average daily output
-    historical_daily_wh = [row.avg_wh for row in historical_rows if row.avg_wh]
-    avg_historical_daily_wh = sum(historical_daily_wh) / len(historical_daily_wh) if historical_daily_wh else 0
 
     # Analyze forecast days - extend to 5 days into the future
     forecast_days = []
     low_output_warning = False
 
     # Create a dict of actual forecast data by date
-    actual_forecast_by_date = {}
-    for row in forecast_rows:
-        actual_forecast_by_date[row.day.strftime("%Y-%m-%d")] = row.avg_wh or 0
+    actual_forecast_by_date: dict[str, float] = dict(forecast_result.all())
+
+    # Without any solar production rows there is nothing to forecast, so skip
+    # the telemetry scan and node analysis but keep the response shape. Days
+    # that produced 0 Wh still count as data and are simulated as before.
+    if historical_rows == 0 and not actual_forecast_by_date:
+        body = orjson.dumps({
+            "lookback_days": lookback_days,
+            "historical_days_analyzed": 0,
+            "avg_historical_daily_wh": 0,
+            "low_output_warning": False,
+            "forecast_days": [],
+            "nodes_at_risk_count": 0,
+            "nodes_at_risk": [],
+            "solar_simulations": [],
+        })
+        _solar_forecast_cache.set(cache_key, body)
+        return ORJSONResponse(body)
 
     # Only generate forecast days for dates where we have actual solar forecast data
     # This limits the forecast to the data available from Forecast.Solar (typically today + 1 day)
+    today_ordinal = today_start.toordinal()
     for day_offset in range(5):  # Check up to 5 days but only include those with data
-        forecast_date = (today_start + timedelta(days=day_offset)).strftime("%Y-%m-%d")
+        forecast_date = date.fromordinal(today_ordinal + day_offset).isoformat()
 
         # Only include days where we have actual forecast data from Forecast.Solar
         if forecast_date not in actual_forecast_by_date:
@@ -1507,464 +1926,260 @@ async def analyze_solar_forecast(
             "is_low": is_low,
         })
 
+    # Phase times and charge factors are the same for every node
+    schedule = _forecast_schedule(forecast_days)
+
     # Get the solar nodes analysis to simulate battery levels
-    # First, get battery/voltage/INA telemetry for identified solar nodes
-    telemetry_result = await db.execute(
-        select(Telemetry, Source.name.label("source_name"))
-        .join(Source)
-        .where(Telemetry.received_at >= cutoff)
-        .where(
-            (Telemetry.battery_level.isnot(None)) |
-            (Telemetry.voltage.isnot(None)) |
-            (Telemetry.metric_name.like("%Voltage"))  # INA sensor voltage channels
-        )
-        .order_by(Telemetry.received_at.asc())
+    # First, get battery/voltage/INA telemetry for identified solar nodes;
+    # rows are streamed in batches and grouped as they arrive.
+    telemetry_result = await db.stream(_solar_telemetry_stmt(cutoff, await _solar_daily_ready(db)))
+
+    # Group readings by node and metric as (times, days, hours, values) columns,
+    # and keep each node's row days (one per reading) for per-day counts
+    node_series: dict[int, SolarSeries] = {}
+    node_row_days: dict[int, array] = {}
+    node_num = series = row_days = None
+
+    async for row in telemetry_result:
+        if row.node_num != node_num:
+            # Rows arrive grouped by node, so look up its buffers once per run
+            node_num = row.node_num
+            series = node_series.setdefault(node_num, {})
+            row_days = node_row_days.setdefault(node_num, array("l"))
+        _add_solar_readings(series, row)
+        row_days.append(row.received_at.toordinal())
+
+    # Get display names only for nodes that reported battery/voltage data
+    node_names = await _node_display_names(db, node_series.keys())
+
+    # Analyze each node's daily patterns (similar to solar-nodes endpoint).
+    # Nodes are independent, so long lookbacks fan out across worker processes.
+    if lookback_days >= _SOLAR_POOL_MIN_DAYS and len(node_series) > 1:
+        loop = asyncio.get_running_loop()
+        pool = _solar_analysis_pool()
+        node_inputs = await asyncio.gather(*(
+            loop.run_in_executor(pool, _solar_forecast_inputs, series, node_row_days[node_num])
+            for node_num, series in node_series.items()
+        ))
+    else:
+        node_inputs = [
+            _solar_forecast_inputs(series, node_row_days[node_num]) for node_num, series in node_series.items()
+        ]
+
+    # Simulation inputs for each solar node with a known battery level
+    solar_nodes: list[tuple[int, str]] = []
+    last_batteries: list[float] = []
+    charge_rates: list[float] = []
+    discharge_rates: list[float] = []
+    charging_hours: list[float] = []
+    discharge_hours: list[float] = []
+
+    for node_num, inputs in zip(node_series, node_inputs, strict=True):
+        if inputs is None:
+            continue
+        chosen_metric_type, last_known_battery, charge_rate, discharge_rate, node_charging, node_discharge = inputs
+        solar_nodes.append((node_num, chosen_metric_type))
+        last_batteries.append(last_known_battery)
+        charge_rates.append(charge_rate)
+        discharge_rates.append(discharge_rate)
+        charging_hours.append(node_charging)
+        discharge_hours.append(node_discharge)
+
+    # Simulate battery level for forecast period (always from battery level)
+    # for every solar node at once
+    min_simulated, simulation_points = _simulate_forecast(
+        now,
+        schedule,
+        np.array(last_batteries, dtype=np.float64),
+        np.array(charge_rates, dtype=np.float64),
+        np.array(discharge_rates, dtype=np.float64),
+        np.array(charging_hours, dtype=np.float64),
+        np.array(discharge_hours, dtype=np.float64),
     )
-    telemetry_rows = telemetry_result.all()
-
-    # Get node names
-    node_result = await db.execute(select(Node))
-    nodes = node_result.scalars().all()
-    node_names: dict[int, str] = {}
-    for node in nodes:
-        if node.long_name:
-            node_names[node.node_num] = node.long_name
-        elif node.short_name:
-            node_names[node.node_num] = node.short_name
-        else:
-            node_names[node.node_num] = f"!{node.node_num:08x}"
-
-    # Group telemetry by node and date to identify solar nodes and their patterns
-    node_data: dict[int, dict[str, list[dict]]] = defaultdict(lambda: defaultdict(list))
-
-    for telemetry, source_name in telemetry_rows:
-        date_str = telemetry.received_at.strftime("%Y-%m-%d")
-
-        # Extract INA voltage from metric_name pattern (ch1Voltage, ch2Voltage, ch3Voltage)
-        ina_voltages: dict[str, float] = {}
-        if telemetry.metric_name and telemetry.metric_name.endswith("Voltage") and telemetry.metric_name != "voltage":
-            ina_voltages[telemetry.metric_name] = telemetry.raw_value
-
-        node_data[telemetry.node_num][date_str].append({
-            "time": telemetry.received_at,
-            "battery": telemetry.battery_level,
-            "voltage": telemetry.voltage,
-            "ina_voltages": ina_voltages,
-        })
+    now_timestamp = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    point_levels = [levels.tolist() for _, _, _, levels in simulation_points]
 
     # Track nodes at risk based on forecast
     nodes_at_risk = []
     # Track simulation for all solar nodes (not just at-risk)
     all_solar_simulations = []
 
-    # Analyze each node's daily patterns (similar to solar-nodes endpoint)
-    for node_num, daily_data in node_data.items():
-        # Track patterns independently for battery and voltage
-        battery_stats = {
-            "days_with_pattern": 0,
-            "total_days": 0,
-            "high_efficiency_days": 0,
-            "charge_rates": [],
-            "discharge_rates": [],
-            "charging_hours_list": [],
-            "discharge_hours_list": [],
-            "previous_day_sunset": None,
-            "total_variance": 0,
-        }
-        voltage_stats = {
-            "days_with_pattern": 0,
-            "total_days": 0,
-            "high_efficiency_days": 0,
-            "charge_rates": [],
-            "discharge_rates": [],
-            "charging_hours_list": [],
-            "discharge_hours_list": [],
-            "previous_day_sunset": None,
-            "total_variance": 0,
-        }
-
-        # Track INA voltage channels dynamically
-        ina_channel_stats: dict[str, dict] = {}
-        ina_channels_seen: set[str] = set()
-        for readings in daily_data.values():
-            for r in readings:
-                for channel_name in r.get("ina_voltages", {}).keys():
-                    ina_channels_seen.add(channel_name)
-        for channel_name in ina_channels_seen:
-            ina_channel_stats[channel_name] = {
-                "days_with_pattern": 0,
-                "total_days": 0,
-                "high_efficiency_days": 0,
-                "charge_rates": [],
-                "discharge_rates": [],
-                "charging_hours_list": [],
-                "discharge_hours_list": [],
-                "previous_day_sunset": None,
-                "total_variance": 0,
+    for i, ((node_num, chosen_metric_type), last_known_battery) in enumerate(
+        zip(solar_nodes, last_batteries, strict=True)
+    ):
+        # Add a "now" point as the starting point for the forecast
+        forecast_simulation = [{
+            "timestamp": now_timestamp,
+            "simulated_battery": round(last_known_battery, 1),
+            "phase": "current",
+            "forecast_factor": 1.0,
+        }]
+        forecast_simulation.extend(
+            {
+                "timestamp": timestamp,
+                "simulated_battery": round(levels[i], 1),
+                "phase": phase,
+                "forecast_factor": forecast_factor,
             }
+            for (timestamp, phase, forecast_factor, _), levels in zip(simulation_points, point_levels, strict=True)
+        )
+        node_min_simulated = float(min_simulated[i])
+        node_name = node_names.get(node_num) or _hex_node_id(node_num)
 
-        # Track last known battery level (independent of pattern detection)
-        last_known_battery = None
-
-        sorted_dates = sorted(daily_data.keys())
-
-        for date_str in sorted_dates:
-            readings = daily_data[date_str]
-            if len(readings) < 3:
-                continue
-
-            readings.sort(key=lambda x: x["time"])
-
-            # Separate battery, voltage, and INA voltage readings
-            battery_values = []
-            voltage_values = []
-            ina_channel_values: dict[str, list[dict]] = {ch: [] for ch in ina_channels_seen}
-
-            for r in readings:
-                if r["battery"] is not None:
-                    battery_values.append({"time": r["time"], "value": r["battery"]})
-                    # Always track last known battery level
-                    last_known_battery = r["battery"]
-                if r["voltage"] is not None:
-                    voltage_values.append({"time": r["time"], "value": r["voltage"]})
-                # Collect INA voltage values
-                for channel_name, value in r.get("ina_voltages", {}).items():
-                    if value is not None:
-                        ina_channel_values[channel_name].append({"time": r["time"], "value": value})
-
-            # Analyze battery independently
-            if len(battery_values) >= 3:
-                battery_result = _analyze_metric_for_solar_patterns(
-                    battery_values, is_battery=True, previous_day_sunset=battery_stats["previous_day_sunset"]
-                )
-                if battery_result:
-                    battery_stats["days_with_pattern"] += 1
-                    battery_stats["charge_rates"].append(battery_result["charge_rate"])
-                    if battery_result["discharge_rate"] is not None:
-                        battery_stats["discharge_rates"].append(battery_result["discharge_rate"])
-                    if battery_result["daylight_hours"]:
-                        battery_stats["charging_hours_list"].append(battery_result["daylight_hours"])
-                    if battery_result["discharge_hours"]:
-                        battery_stats["discharge_hours_list"].append(battery_result["discharge_hours"])
-                    battery_stats["total_variance"] += battery_result["daily_range"]
-                    if battery_result["is_high_efficiency"]:
-                        battery_stats["high_efficiency_days"] += 1
-                    battery_stats["previous_day_sunset"] = {
-                        "time": battery_result["sunset"]["time"],
-                        "value": battery_result["sunset"]["value"],
-                    }
-                    battery_stats["total_days"] += 1
-                elif battery_values:
-                    all_vals = [v["value"] for v in battery_values]
-                    daily_range = max(all_vals) - min(all_vals)
-                    if daily_range >= 2:
-                        battery_stats["total_days"] += 1
-
-            # Analyze voltage independently
-            if len(voltage_values) >= 3:
-                voltage_result = _analyze_metric_for_solar_patterns(
-                    voltage_values, is_battery=False, previous_day_sunset=voltage_stats["previous_day_sunset"]
-                )
-                if voltage_result:
-                    voltage_stats["days_with_pattern"] += 1
-                    voltage_stats["charge_rates"].append(voltage_result["charge_rate"])
-                    if voltage_result["discharge_rate"] is not None:
-                        voltage_stats["discharge_rates"].append(voltage_result["discharge_rate"])
-                    if voltage_result["daylight_hours"]:
-                        voltage_stats["charging_hours_list"].append(voltage_result["daylight_hours"])
-                    if voltage_result["discharge_hours"]:
-                        voltage_stats["discharge_hours_list"].append(voltage_result["discharge_hours"])
-                    voltage_stats["total_variance"] += voltage_result["daily_range"]
-                    if voltage_result["is_high_efficiency"]:
-                        voltage_stats["high_efficiency_days"] += 1
-                    voltage_stats["previous_day_sunset"] = {
-                        "time": voltage_result["sunset"]["time"],
-                        "value": voltage_result["sunset"]["value"],
-                    }
-                    voltage_stats["total_days"] += 1
-                elif voltage_values:
-                    all_vals = [v["value"] for v in voltage_values]
-                    daily_range = max(all_vals) - min(all_vals)
-                    if daily_range >= 0.05:
-                        voltage_stats["total_days"] += 1
-
-            # Analyze each INA voltage channel independently
-            for channel_name, channel_values in ina_channel_values.items():
-                if len(channel_values) >= 3:
-                    stats = ina_channel_stats[channel_name]
-                    ina_result = _analyze_metric_for_solar_patterns(
-                        channel_values, is_battery=False, previous_day_sunset=stats["previous_day_sunset"]
-                    )
-                    if ina_result:
-                        stats["days_with_pattern"] += 1
-                        stats["charge_rates"].append(ina_result["charge_rate"])
-                        if ina_result["discharge_rate"] is not None:
-                            stats["discharge_rates"].append(ina_result["discharge_rate"])
-                        if ina_result["daylight_hours"]:
-                            stats["charging_hours_list"].append(ina_result["daylight_hours"])
-                        if ina_result["discharge_hours"]:
-                            stats["discharge_hours_list"].append(ina_result["discharge_hours"])
-                        stats["total_variance"] += ina_result["daily_range"]
-                        if ina_result["is_high_efficiency"]:
-                            stats["high_efficiency_days"] += 1
-                        stats["previous_day_sunset"] = {
-                            "time": ina_result["sunset"]["time"],
-                            "value": ina_result["sunset"]["value"],
-                        }
-                        stats["total_days"] += 1
-                    elif channel_values:
-                        all_vals = [v["value"] for v in channel_values]
-                        daily_range = max(all_vals) - min(all_vals)
-                        if daily_range >= 0.01:
-                            stats["total_days"] += 1
-
-        # Determine if node is solar-powered based on ANY metric showing patterns
-        battery_is_solar = False
-        voltage_is_solar = False
-        ina_channels_solar: dict[str, bool] = {}
-
-        if battery_stats["total_days"] >= 2:
-            is_mostly_high_eff = battery_stats["high_efficiency_days"] > battery_stats["total_days"] * 0.5
-            min_ratio = 0.33 if is_mostly_high_eff else 0.5
-            if battery_stats["days_with_pattern"] / battery_stats["total_days"] >= min_ratio:
-                battery_is_solar = True
+        # Add to all solar simulations list (for chart display)
+        # At-risk threshold only applies to battery-based nodes (40%)
+        at_risk_threshold = 40 if chosen_metric_type == "battery" else None
+        all_solar_simulations.append({
+            "node_num": node_num,
+            "node_name": node_name,
+            "current_battery": round(last_known_battery, 1),
+            "min_simulated_battery": round(node_min_simulated, 1),
+            "avg_charge_rate_per_hour": round(charge_rates[i], 2),
+            "avg_discharge_rate_per_hour": round(discharge_rates[i], 2),
+            "simulation": forecast_simulation,
+            "metric_type": chosen_metric_type,
+            "at_risk_threshold": at_risk_threshold,
+        })
 
-        if voltage_stats["total_days"] >= 2:
-            is_mostly_high_eff = voltage_stats["high_efficiency_days"] > voltage_stats["total_days"] * 0.5
-            min_ratio = 0.33 if is_mostly_high_eff else 0.5
-            if voltage_stats["days_with_pattern"] / voltage_stats["total_days"] >= min_ratio:
-                voltage_is_solar = True
-
-        # Check INA voltage channels
-        for channel_name, stats in ina_channel_stats.items():
-            if stats["total_days"] >= 2:
-                is_mostly_high_eff = stats["high_efficiency_days"] > stats["total_days"] * 0.5
-                min_ratio = 0.33 if is_mostly_high_eff else 0.5
-                if stats["days_with_pattern"] / stats["total_days"] >= min_ratio:
-                    ina_channels_solar[channel_name] = True
-
-        # Node is solar if ANY metric shows patterns
-        any_ina_solar = any(ina_channels_solar.values())
-        if (battery_is_solar or voltage_is_solar or any_ina_solar) and last_known_battery is not None:
-            # Choose which metric's rates to use for simulation
-            # Consider battery, voltage, and INA channels - pick the one with best variance
-            chosen_stats = None
-            best_variance = 0
-
-            # Collect all solar metrics with their normalized variance
-            metric_candidates = []
-            if battery_is_solar:
-                metric_candidates.append(("battery", battery_stats, battery_stats["total_variance"]))
-            if voltage_is_solar:
-                normalized = voltage_stats["total_variance"] * (100 / 5)
-                metric_candidates.append(("voltage", voltage_stats, normalized))
-            for channel_name, is_solar in ina_channels_solar.items():
-                if is_solar:
-                    stats = ina_channel_stats[channel_name]
-                    normalized = stats["total_variance"] * (100 / 5)
-                    metric_candidates.append((channel_name, stats, normalized))
-
-            # Pick the metric with highest normalized variance
-            chosen_metric_type = None
-            for name, stats, variance in metric_candidates:
-                if variance > best_variance:
-                    best_variance = variance
-                    chosen_stats = stats
-                    chosen_metric_type = name
-
-            # Fallback
-            if chosen_stats is None:
-                if battery_is_solar:
-                    chosen_stats = battery_stats
-                    chosen_metric_type = "battery"
-                elif voltage_is_solar:
-                    chosen_stats = voltage_stats
-                    chosen_metric_type = "voltage"
-                elif ina_channels_solar:
-                    for channel_name, is_solar in ina_channels_solar.items():
-                        if is_solar:
-                            chosen_stats = ina_channel_stats[channel_name]
-                            chosen_metric_type = channel_name
-                            break
-
-            charge_rates = [r for r in (chosen_stats["charge_rates"] if chosen_stats else []) if r is not None]
-            discharge_rates = [r for r in (chosen_stats["discharge_rates"] if chosen_stats else []) if r is not None]
-            avg_charge_rate = sum(charge_rates) / len(charge_rates) if charge_rates else 0
-            avg_discharge_rate = sum(discharge_rates) / len(discharge_rates) if discharge_rates else 0
-            valid_charging_hours = [h for h in (chosen_stats["charging_hours_list"] if chosen_stats else []) if h is not None]
-            valid_discharge_hours = [h for h in (chosen_stats["discharge_hours_list"] if chosen_stats else []) if h is not None]
-            avg_charging_hours = sum(valid_charging_hours) / len(valid_charging_hours) if valid_charging_hours else 10
-            avg_discharge_hours = sum(valid_discharge_hours) / len(valid_discharge_hours) if valid_discharge_hours else 14
-
-            # Simulate using battery level (we always need battery for the simulation)
-            if last_known_battery is not None:
-                # Simulate battery level for forecast period
-                simulated_battery = last_known_battery
-                min_simulated = last_known_battery
-                forecast_simulation = []
-
-                # Add a "now" point as the starting point for the forecast
-                forecast_simulation.append({
-                    "timestamp": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "simulated_battery": round(last_known_battery, 1),
-                    "phase": "current",
-                    "forecast_factor": 1.0,
-                })
-
-                for day_idx, day_forecast in enumerate(forecast_days):
-                    # Adjust charge rate based on forecast solar output
-                    forecast_factor = day_forecast["pct_of_average"] / 100 if day_forecast["pct_of_average"] > 0 else 0.5
-                    effective_charge_rate = avg_charge_rate * forecast_factor
-                    day_date = day_forecast["date"]
-
-                    # Parse the day date for time comparisons
-                    day_start = datetime.strptime(day_date, "%Y-%m-%d").replace(tzinfo=UTC)
-                    sunrise_time = day_start.replace(hour=12)  # 12:00 UTC = ~7am EST
-                    peak_time = day_start.replace(hour=19)     # 19:00 UTC = ~2pm EST
-                    sunset_time = day_start.replace(hour=23)   # 23:00 UTC = ~6pm EST
-
-                    # For the first day (today), only add points that are in the future
-                    is_first_day = day_idx == 0
-
-                    # Point 1: Sunrise (~7am) - battery level after overnight discharge
-                    if not is_first_day or sunrise_time > now:
-                        # Only apply full overnight discharge for future days
-                        if not is_first_day:
-                            simulated_battery -= avg_discharge_rate * avg_discharge_hours
-                        else:
-                            # For today, calculate hours until sunrise if it's in the future
-                            hours_until_sunrise = (sunrise_time - now).total_seconds() / 3600
-                            if hours_until_sunrise > 0:
-                                simulated_battery -= avg_discharge_rate * hours_until_sunrise
-                        simulated_battery = max(0, min(100, simulated_battery))
-                        sunrise_battery = simulated_battery
-                        min_simulated = min(min_simulated, sunrise_battery)
-                        forecast_simulation.append({
-                            "timestamp": f"{day_date}T12:00:00Z",
-                            "simulated_battery": round(sunrise_battery, 1),
-                            "phase": "sunrise",
-                            "forecast_factor": round(forecast_factor, 2),
-                        })
-
-                    # Point 2: Peak (~2pm) - battery level at max charge
-                    if not is_first_day or peak_time > now:
-                        if is_first_day and sunrise_time <= now < peak_time:
-                            # Currently in charging phase - calculate partial charge
-                            hours_charging = (peak_time - now).total_seconds() / 3600
-                            simulated_battery += effective_charge_rate * hours_charging
-                        elif not is_first_day or sunrise_time > now:
-                            # Full charging phase
-                            simulated_battery += effective_charge_rate * avg_charging_hours
-                        simulated_battery = max(0, min(100, simulated_battery))
-                        peak_battery = simulated_battery
-                        forecast_simulation.append({
-                            "timestamp": f"{day_date}T19:00:00Z",
-                            "simulated_battery": round(peak_battery, 1),
-                            "phase": "peak",
-                            "forecast_factor": round(forecast_factor, 2),
-                        })
-
-                    # Point 3: Sunset (~6pm) - battery level when discharging starts
-                    if not is_first_day or sunset_time > now:
-                        # Slight discharge during afternoon (2pm-6pm is ~4 hours of lower efficiency)
-                        afternoon_hours = 4
-                        if is_first_day and peak_time <= now < sunset_time:
-                            # Currently in afternoon discharge
-                            hours_remaining = (sunset_time - now).total_seconds() / 3600
-                            simulated_battery -= avg_discharge_rate * hours_remaining * 0.3
-                        else:
-                            simulated_battery -= avg_discharge_rate * afternoon_hours * 0.3
-                        simulated_battery = max(0, min(100, simulated_battery))
-                        sunset_battery = simulated_battery
-                        forecast_simulation.append({
-                            "timestamp": f"{day_date}T23:00:00Z",
-                            "simulated_battery": round(sunset_battery, 1),
-                            "phase": "sunset",
-                            "forecast_factor": round(forecast_factor, 2),
-                        })
-
-                # Add to all solar simulations list (for chart display)
-                # At-risk threshold only applies to battery-based nodes (40%)
-                at_risk_threshold = 40 if chosen_metric_type == "battery" else None
-                all_solar_simulations.append({
-                    "node_num": node_num,
-                    "node_name": node_names.get(node_num, f"!{node_num:08x}"),
-                    "current_battery": round(last_known_battery, 1),
-                    "min_simulated_battery": round(min_simulated, 1),
-                    "avg_charge_rate_per_hour": round(avg_charge_rate, 2),
-                    "avg_discharge_rate_per_hour": round(avg_discharge_rate, 2),
-                    "simulation": forecast_simulation,
-                    "metric_type": chosen_metric_type,
-                    "at_risk_threshold": at_risk_threshold,
-                })
-
-                # Flag if simulation shows battery dropping below 40% threshold
-                # Only applies to battery-based nodes since simulation uses battery percentage
-                # Voltage/INA nodes are excluded because their chart shows voltage but simulation uses battery %
-                if chosen_metric_type == "battery" and min_simulated < 40:
-                    nodes_at_risk.append({
-                        "node_num": node_num,
-                        "node_name": node_names.get(node_num, f"!{node_num:08x}"),
-                        "current_battery": round(last_known_battery, 1),
-                        "min_simulated_battery": round(min_simulated, 1),
-                        "avg_charge_rate_per_hour": round(avg_charge_rate, 2),
-                        "avg_discharge_rate_per_hour": round(avg_discharge_rate, 2),
-                        "simulation": forecast_simulation,
-                        "metric_type": "battery",
-                        "at_risk_threshold": 40,
-                    })
+        # Flag if simulation shows battery dropping below 40% threshold
+        # Only applies to battery-based nodes since simulation uses battery percentage
+        # Voltage/INA nodes are excluded because their chart shows voltage but simulation uses battery %
+        if chosen_metric_type == "battery" and node_min_simulated < 40:
+            nodes_at_risk.append({
+                "node_num": node_num,
+                "node_name": node_name,
+                "current_battery": round(last_known_battery, 1),
+                "min_simulated_battery": round(node_min_simulated, 1),
+                "avg_charge_rate_per_hour": round(charge_rates[i], 2),
+                "avg_discharge_rate_per_hour": round(discharge_rates[i], 2),
+                "simulation": forecast_simulation,
+                "metric_type": "battery",
+                "at_risk_threshold": 40,
+            })
 
-    # Sort nodes at risk by minimum simulated battery (lowest first)
-    nodes_at_risk.sort(key=lambda x: x["min_simulated_battery"])
+    # Sort nodes at risk by minimum simulated battery (lowest first); with a
+    # limit, only the lowest N are selected instead of sorting them all
+    nodes_at_risk_count = len(nodes_at_risk)
+    min_battery_key = itemgetter("min_simulated_battery")
+    if limit is not None:
+        nodes_at_risk = heapq.nsmallest(limit, nodes_at_risk, key=min_battery_key)
+    else:
+        nodes_at_risk.sort(key=min_battery_key)
 
-    return {
+    body = orjson.dumps({
         "lookback_days": lookback_days,
-        "historical_days_analyzed": len(historical_daily_wh),
+        "historical_days_analyzed": historical_days,
         "avg_historical_daily_wh": round(avg_historical_daily_wh, 1),
         "low_output_warning": low_output_warning,
         "forecast_days": forecast_days,
-        "nodes_at_risk_count": len(nodes_at_risk),
+        "nodes_at_risk_count": nodes_at_risk_count,
         "nodes_at_risk": nodes_at_risk,
         "solar_simulations": all_solar_simulations,
-    }
+    })
+    _solar_forecast_cache.set(cache_key, body)
+    return ORJSONResponse(body)
+
+
+# Solar production is stored in hourly buckets, so /solar output only changes
+# when the hour rolls over or new forecast data is ingested.
+_solar_averages_cache = TTLCache(ttl=300)
+
+# Hourly rows shared by /solar and solar-nodes: the default 168-hour chart
+# and 7-day analysis windows reuse one aggregation.
+_solar_hourly_cache = TTLCache(ttl=300)
+
+
+async def _hourly_solar_production(db: AsyncSession, hours: int) -> list[Row]:
+    """Solar production over the last hours, averaged across sources per hour.
+
+    Rows carry timestamp (epoch milliseconds), watt_hours (rounded to two
+    decimals) and source_count, oldest first, all computed in SQL. Results
+    are cached per (hours, current hour) for a few minutes.
+    """
+    now = datetime.now(UTC)
+    cache_key = (hours, now.replace(minute=0, second=0, microsecond=0))
+    cached = _solar_hourly_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Snap to hours so sources reporting off the hour share a bucket, then
+    # average watt_hours across the sources in each bucket
+    bucket = func.date_trunc("hour", SolarProduction.timestamp)
+    result = await db.execute(
+        select(
+            (extract("epoch", bucket) * 1000).cast(BigInteger).label("timestamp"),
+            func.round(cast(func.avg(SolarProduction.watt_hours), Numeric), 2)
+            .cast(Float)
+            .label("watt_hours"),
+            func.count(distinct(SolarProduction.source_id)).label("source_count"),
+        )
+        .where(SolarProduction.timestamp >= now - timedelta(hours=hours))
+        .group_by(bucket)
+        .order_by(bucket.asc())
+    )
+    rows = result.all()
+    _solar_hourly_cache.set(cache_key, rows)
+    return rows
 
 
-@router.get("/solar")
+@router.get("/solar", response_class=ORJSONResponse)
 async def get_solar_averages(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     hours: int = Query(default=168, ge=1, le=8760, description="Hours of history to fetch"),
+    columnar: bool = Query(default=False, description="Return one array per field instead of one object per record"),
     _access: None = Depends(require_tab_access("analysis")),
-) -> list[dict]:
+) -> Response:
     """Get averaged solar production data across all sources.
 
     Groups solar production data by timestamp (hourly buckets) and averages
     watt_hours across all sources that have data for each time point.
 
     Returns data suitable for rendering a solar background on telemetry charts.
+    With columnar=true the response is instead a single object holding
+    timestamp (epoch milliseconds), wattHours and sourceCount arrays.
+    Responses are cached per (hours, columnar, current hour) for a few minutes.
+    The ETag is a hash of the cached body, so it always matches what is
+    served and repeat polls within the window skip the database entirely.
     """
-    cutoff = datetime.now(UTC) - timedelta(hours=hours)
+    now = datetime.now(UTC)
+    cache_key = (hours, columnar, now.replace(minute=0, second=0, microsecond=0))
+    cached = _solar_averages_cache.get(cache_key)
+    if cached is None:
+        body = _solar_averages_body(await _hourly_solar_production(db, hours), columnar)
+        cached = (weak_etag(body), body)
+        _solar_averages_cache.set(cache_key, cached)
+
+    etag, body = cached
+    if (not_modified_response := not_modified(request, etag)) is not None:
+        return not_modified_response
+    response = ORJSONResponse(body)
+    set_etag(response, etag)
+    return response
 
-    # Query to group by timestamp and average watt_hours across sources
-    result = await db.execute(
-        select(
-            SolarProduction.timestamp,
-            func.avg(SolarProduction.watt_hours).label("avg_watt_hours"),
-            func.count(SolarProduction.source_id).label("source_count"),
-        )
-        .where(SolarProduction.timestamp >= cutoff)
-        .group_by(SolarProduction.timestamp)
-        .order_by(SolarProduction.timestamp.asc())
-    )
-    rows = result.all()
 
-    return [
+def _solar_averages_body(rows: list[Row], columnar: bool) -> bytes:
+    """Serialize _hourly_solar_production rows as the /solar response body."""
+    if columnar:
+        # Epoch ms (< 2**53) and source counts are exact in float64, so all
+        # three columns load in one pass and are split afterwards.
+        table = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=3 * len(rows)).reshape(-1, 3)
+        return orjson.dumps(
+            {
+                "timestamp": table[:, 0].astype(np.int64),
+                "wattHours": np.ascontiguousarray(table[:, 1]),
+                "sourceCount": table[:, 2].astype(np.int32),
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return orjson.dumps([
         {
-            "timestamp": int(row.timestamp.timestamp() * 1000),  # milliseconds for JS
-            "wattHours": round(row.avg_watt_hours, 2),
+            "timestamp": row.timestamp,  # milliseconds for JS
+            "wattHours": row.watt_hours,
             "sourceCount": row.source_count,
         }
         for row in rows
-    ]
+    ])
 
 
 # Solar schedule settings key
@@ -2080,9 +2295,258 @@ async def test_solar_notification(
     return {"success": True, "message": "Test notification sent successfully"}
 
 
-@router.get("/analysis/message-utilization")
+async def _fetch_rows(
+    session_factory: async_sessionmaker[AsyncSession],
+    stmt: Select | None,
+    params: dict[str, Any] | None = None,
+) -> list[Row]:
+    """Run ``stmt`` on a dedicated session and return all rows.
+
+    Returns an empty list when ``stmt`` is None so disabled queries can be
+    passed to ``asyncio.gather`` alongside enabled ones.
+    """
+    if stmt is None:
+        return []
+    async with session_factory() as session:
+        result = await session.execute(stmt, params)
+        return list(result.all())
+
+
+def _count_packets_by_hour(packets: Select | CompoundSelect) -> Select:
+    """Count deduplicated packets per node, type and UTC hour of day.
+
+    ``packets`` must yield one row per unique packet with a ``node_num`` and
+    ``received_at`` column, plus an optional ``type_key`` column.
+    """
+    subq = packets.subquery()
+    keys = [subq.c.node_num]
+    if "type_key" in subq.c:
+        keys.append(subq.c.type_key)
+    hour = extract("hour", func.timezone(literal_column("'UTC'"), subq.c.received_at))
+    return (
+        select(*keys, hour.label("hour"), func.count().label("count"))
+        .group_by(*keys, hour)
+    )
+
+
+@cache
+def _message_utilization_stmt(
+    include_text: bool,
+    include_telemetry: bool,
+    include_traceroute: bool,
+    include_packet_records: bool,
+    exclude_local: bool,
+    exclude_meshmonitor: bool,
+) -> Select | None:
+    """Build the message utilization aggregate for one filter combination.
+
+    Messages, telemetry, traceroutes and packet records are deduplicated per
+    table and bucketed by (node, type, hour) in one UNION ALL query, so only
+    the aggregated grid is returned. Everything request-specific is a bind
+    parameter filled in by ``_message_utilization_params``, so each of the
+    few flag combinations is constructed once per process. Returns None when
+    every source is disabled.
+    """
+    cutoff = bindparam("cutoff")
+
+    # (source_id, node_num) pair lists are passed as two parallel arrays and
+    # unnested. Postgres runs a row IN against a literal list as a chain of
+    # ORs for every row, but turns EXISTS over the unnested pairs into one
+    # hashed (anti-)join. Unlike a row NOT IN, a NULL node number never
+    # matches a pair, so such rows are kept, as the Python set lookups did.
+    def _has_pair(prefix: str, source_id, node_num) -> Exists:
+        pairs = func.unnest(
+            bindparam(f"{prefix}_source_ids", type_=ARRAY(UUID(as_uuid=False))),
+            bindparam(f"{prefix}_node_nums", type_=ARRAY(BigInteger)),
+        ).table_valued("source_id", "node_num").render_derived()
+        return exists().where(pairs.c.source_id == source_id, pairs.c.node_num == node_num)
+
+    def _not_local(source_id, from_node):
+        return ~_has_pair("local", source_id, from_node)
+
+    def _is_internal(source_id, from_node, to_node):
+        # Both ends are local nodes of the same MeshMonitor source
+        return and_(
+            _has_pair("meshmonitor", source_id, from_node),
+            _has_pair("meshmonitor", source_id, to_node),
+        )
+
+    packet_legs: list[Select] = []
+    if include_text:
+        # Dedup: same packet seen via multiple sources. Messages without a
+        # meshtastic_id cannot be matched, so each one is its own group.
+        message_packets = (
+            select(
+                Message.from_node_num.label("node_num"),
+                literal_column("'text'").label("type_key"),
+                func.min(Message.received_at).label("received_at"),
+            )
+            .where(Message.received_at >= cutoff)
+            .group_by(
+                Message.from_node_num,
+                Message.meshtastic_id,
+                case((Message.meshtastic_id.is_(None), Message.id)),
+            )
+        )
+        # Always exclude MeshMonitor internal messages (never traverse the mesh)
+        if exclude_meshmonitor:
+            message_packets = message_packets.where(
+                or_(
+                    Message.to_node_num.is_(None),
+                    ~_is_internal(
+                        Message.source_id, Message.from_node_num, Message.to_node_num
+                    ),
+                )
+            )
+        # Skip messages from locally connected nodes if flag is set
+        if exclude_local:
+            message_packets = message_packets.where(
+                _not_local(Message.source_id, Message.from_node_num)
+            )
+        packet_legs.append(message_packets)
+
+    if include_telemetry:
+        # Dedup: prefer meshtastic_id, fall back to timestamp-based key.
+        # Use telemetry_type (not metric_name) because one packet produces
+        # multiple metric rows — we want to count packets, not metrics.
+        # Truncate to second for the fallback key because MeshMonitor
+        # stores per-metric timestamps that differ by milliseconds
+        # within the same packet.
+        no_id = Telemetry.meshtastic_id.is_(None)
+        telemetry_packets = (
+            select(
+                Telemetry.node_num.label("node_num"),
+                # Telemetry types are stored by enum name (e.g. "AIR_QUALITY"),
+                # so map them to the value keys the response uses
+                case(
+                    {t: t.value for t in TelemetryType},
+                    value=func.min(Telemetry.telemetry_type),
+                ).label("type_key"),
+                func.min(Telemetry.received_at).label("received_at"),
+            )
+            .where(Telemetry.received_at >= cutoff)
+            .where(Telemetry.telemetry_type.in_(bindparam("telemetry_types", expanding=True)))
+            # Skip MeshMonitor metadata metrics (not actual mesh packets)
+            .where(
+                or_(
+                    Telemetry.metric_name.is_(None),
+                    Telemetry.metric_name.not_in(NON_MESH_METRICS),
+                )
+            )
+            .group_by(
+                Telemetry.node_num,
+                Telemetry.meshtastic_id,
+                case((no_id, Telemetry.telemetry_type)),
+                case((no_id, func.date_trunc(literal_column("'second'"), Telemetry.received_at))),
+            )
+        )
+        # Skip telemetry from locally connected nodes if flag is set
+        if exclude_local:
+            telemetry_packets = telemetry_packets.where(
+                _not_local(Telemetry.source_id, Telemetry.node_num)
+            )
+        packet_legs.append(telemetry_packets)
+
+    if include_traceroute:
+        # Dedup: prefer meshtastic_id, fall back to timestamp-based key
+        no_id = Traceroute.meshtastic_id.is_(None)
+        traceroute_packets = (
+            select(
+                Traceroute.from_node_num.label("node_num"),
+                literal_column("'traceroute'").label("type_key"),
+                func.min(Traceroute.received_at).label("received_at"),
+            )
+            .where(Traceroute.received_at >= cutoff)
+            .group_by(
+                Traceroute.from_node_num,
+                Traceroute.meshtastic_id,
+                case((no_id, Traceroute.to_node_num)),
+                case((no_id, Traceroute.received_at)),
+            )
+        )
+        # Exclude MeshMonitor internal traceroutes (both nodes local)
+        if exclude_meshmonitor:
+            traceroute_packets = traceroute_packets.where(
+                ~_is_internal(
+                    Traceroute.source_id,
+                    Traceroute.from_node_num,
+                    Traceroute.to_node_num,
+                )
+            )
+        if exclude_local:
+            traceroute_packets = traceroute_packets.where(
+                _not_local(Traceroute.source_id, Traceroute.from_node_num)
+            )
+        packet_legs.append(traceroute_packets)
+
+    if include_packet_records:
+        # Dedup: prefer meshtastic_id, fall back to timestamp-based key
+        no_id = PacketRecord.meshtastic_id.is_(None)
+        record_packets = (
+            select(
+                PacketRecord.from_node_num.label("node_num"),
+                cast(func.min(PacketRecord.packet_type), String).label("type_key"),
+                func.min(PacketRecord.received_at).label("received_at"),
+            )
+            .where(PacketRecord.received_at >= cutoff)
+            .where(PacketRecord.packet_type.in_(bindparam("packet_record_types", expanding=True)))
+            .group_by(
+                PacketRecord.from_node_num,
+                PacketRecord.meshtastic_id,
+                case((no_id, PacketRecord.packet_type)),
+                case((no_id, PacketRecord.received_at)),
+            )
+        )
+        # Exclude MeshMonitor internal packets (both nodes local) — only if to_node is set
+        if exclude_meshmonitor:
+            record_packets = record_packets.where(
+                or_(
+                    PacketRecord.to_node_num.is_(None),
+                    ~_is_internal(
+                        PacketRecord.source_id,
+                        PacketRecord.from_node_num,
+                        PacketRecord.to_node_num,
+                    ),
+                )
+            )
+        if exclude_local:
+            record_packets = record_packets.where(
+                _not_local(PacketRecord.source_id, PacketRecord.from_node_num)
+            )
+        packet_legs.append(record_packets)
+
+    if not packet_legs:
+        return None
+    return _count_packets_by_hour(union_all(*packet_legs))
+
+
+def _message_utilization_params(
+    cutoff: datetime,
+    telemetry_types: list[TelemetryType],
+    packet_record_types: list[PacketRecordType],
+    local_pairs: list[tuple[str, int]],
+    meshmonitor_pairs: list[tuple[str, int]],
+) -> dict[str, Any]:
+    """Bind values for a statement built by ``_message_utilization_stmt``."""
+    return {
+        "cutoff": cutoff,
+        "telemetry_types": telemetry_types,
+        "packet_record_types": packet_record_types,
+        "local_source_ids": [source_id for source_id, _ in local_pairs],
+        "local_node_nums": [node_num for _, node_num in local_pairs],
+        "meshmonitor_source_ids": [source_id for source_id, _ in meshmonitor_pairs],
+        "meshmonitor_node_nums": [node_num for _, node_num in meshmonitor_pairs],
+    }
+
+
+# Utilization only shifts meaningfully minute to minute, so dashboards polling
+# with the same filters share one computation per minute bucket
+_message_utilization_cache = TTLCache(ttl=60)
+
+
+@router.get("/analysis/message-utilization", response_class=ORJSONResponse)
 async def analyze_message_utilization(
-    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_maker),
     lookback_days: int = Query(default=7, ge=1, le=90, description="Days of history to analyze"),
     include_text: bool = Query(default=True, description="Include text messages"),
     include_device: bool = Query(default=True, description="Include device telemetry"),
@@ -2096,7 +2560,7 @@ async def analyze_message_utilization(
     include_unknown: bool = Query(default=True, description="Include unknown portnum packets"),
     exclude_local_nodes: bool = Query(default=False, description="Exclude telemetry from nodes directly connected to sources (hops_away=0)"),
     _access: None = Depends(require_tab_access("analysis")),
-) -> dict:
+) -> ORJSONResponse:
     """Analyze message utilization across the mesh network.
 
     Returns:
@@ -2107,31 +2571,51 @@ async def analyze_message_utilization(
     """
     from collections import defaultdict
 
-    cutoff = datetime.now(UTC) - timedelta(days=lookback_days)
+    filters = {
+        "text": include_text,
+        "device": include_device,
+        "environment": include_environment,
+        "power": include_power,
+        "position": include_position,
+        "air_quality": include_air_quality,
+        "traceroute": include_traceroute,
+        "nodeinfo": include_nodeinfo,
+        "encrypted": include_encrypted,
+        "unknown": include_unknown,
+        "exclude_local_nodes": exclude_local_nodes,
+    }
+    now = datetime.now(UTC)
+    cache_key = (lookback_days, tuple(filters.values()), now.replace(second=0, microsecond=0))
+    cached = _message_utilization_cache.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
 
-    # Get node names for display and identify local nodes
-    node_result = await db.execute(select(Node))
-    nodes = node_result.scalars().all()
-    node_names: dict[int, str] = {}
-    # Track local nodes: set of (source_id, node_num) tuples for nodes with hops_away == 0
-    local_nodes: set[tuple[str, int]] = set()
-    for node in nodes:
-        if node.long_name:
-            node_names[node.node_num] = node.long_name
-        elif node.short_name:
-            node_names[node.node_num] = node.short_name
-        else:
-            node_names[node.node_num] = f"!{node.node_num:08x}"
+    cutoff = now - timedelta(days=lookback_days)
+
+    # Identify local nodes and the MeshMonitor sources. The lookups are
+    # independent, so run them concurrently, each on its own session (an
+    # AsyncSession is not safe for concurrent use).
+    local_node_rows, meshmonitor_sources = await asyncio.gather(
         # Track locally connected nodes (hops_away == 0 or NULL)
         # NULL typically means the node is the local node (source's own node)
-        if node.hops_away is None or node.hops_away == 0:
-            local_nodes.add((node.source_id, node.node_num))
+        _fetch_rows(
+            session_factory,
+            select(Node.source_id, Node.node_num).where(
+                or_(Node.hops_away.is_(None), Node.hops_away == 0)
+            ),
+        ),
+        _fetch_rows(
+            session_factory,
+            select(Source.id).where(Source.type == SourceType.MESHMONITOR),
+        ),
+    )
+    # Track local nodes: set of (source_id, node_num) tuples
+    local_nodes: set[tuple[str, int]] = {
+        (source_id, node_num) for source_id, node_num in local_node_rows
+    }
 
     # Build lookup of local node numbers per MeshMonitor source
-    source_result = await db.execute(
-        select(Source).where(Source.type == SourceType.MESHMONITOR)
-    )
-    meshmonitor_source_ids = {s.id for s in source_result.scalars().all()}
+    meshmonitor_source_ids = {source_id for (source_id,) in meshmonitor_sources}
 
     meshmonitor_local_nodes: dict[str, set[int]] = defaultdict(set)
     for source_id, node_num in local_nodes:
@@ -2140,39 +2624,15 @@ async def analyze_message_utilization(
 
     # Track counts
     node_counts: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-    hourly_counts: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    # One slot per hour of day, indexed directly by hour
+    hourly_counts: list[dict[str, int]] = [defaultdict(int) for _ in range(24)]
     type_totals: dict[str, int] = defaultdict(int)
 
-    def _record(from_node: int, type_key: str, hour: int) -> None:
-        """Record a counted packet in all tracking dicts."""
-        node_counts[from_node][type_key] += 1
-        hourly_counts[hour][type_key] += 1
-        type_totals[type_key] += 1
-
-    # Query text messages if enabled
-    if include_text:
-        msg_result = await db.execute(
-            select(Message)
-            .where(Message.received_at >= cutoff)
-        )
-        messages = msg_result.scalars().all()
-
-        seen_msgs: set[tuple] = set()
-        for msg in messages:
-            # Always exclude MeshMonitor internal messages (never traverse the mesh)
-            if msg.source_id in meshmonitor_local_nodes:
-                local_nums = meshmonitor_local_nodes[msg.source_id]
-                if msg.from_node_num in local_nums and msg.to_node_num in local_nums:
-                    continue
-            # Skip messages from locally connected nodes if flag is set
-            if exclude_local_nodes and (msg.source_id, msg.from_node_num) in local_nodes:
-                continue
-            # Dedup: same packet seen via multiple sources
-            dedup_key = (msg.from_node_num, msg.meshtastic_id)
-            if msg.meshtastic_id is not None and dedup_key in seen_msgs:
-                continue
-            seen_msgs.add(dedup_key)
-            _record(msg.from_node_num, "text", msg.received_at.hour)
+    def _record(from_node: int, type_key: str, hour: int, count: int = 1) -> None:
+        """Record counted packets in all tracking dicts."""
+        node_counts[from_node][type_key] += count
+        hourly_counts[hour][type_key] += count
+        type_totals[type_key] += count
 
     # Build telemetry type filters
     telemetry_types = []
@@ -2187,65 +2647,7 @@ async def analyze_message_utilization(
     if include_air_quality:
         telemetry_types.append(TelemetryType.AIR_QUALITY)
 
-    # Query telemetry if any types are enabled
-    if telemetry_types:
-        telemetry_result = await db.execute(
-            select(Telemetry)
-            .where(Telemetry.received_at >= cutoff)
-            .where(Telemetry.telemetry_type.in_(telemetry_types))
-        )
-        telemetry_rows = telemetry_result.scalars().all()
-
-        seen_telemetry: set[tuple] = set()
-        for t in telemetry_rows:
-            # Skip MeshMonitor metadata metrics (not actual mesh packets)
-            if t.metric_name in NON_MESH_METRICS:
-                continue
-            # Skip telemetry from locally connected nodes if flag is set
-            if exclude_local_nodes and (t.source_id, t.node_num) in local_nodes:
-                continue
-            # Dedup: prefer meshtastic_id, fall back to timestamp-based key.
-            # Use telemetry_type (not metric_name) because one packet produces
-            # multiple metric rows — we want to count packets, not metrics.
-            # Truncate to second for the fallback key because MeshMonitor
-            # stores per-metric timestamps that differ by milliseconds
-            # within the same packet.
-            if t.meshtastic_id is not None:
-                dedup_key = (t.node_num, t.meshtastic_id)
-            else:
-                dedup_key = (t.node_num, t.telemetry_type, t.received_at.replace(microsecond=0))
-            if dedup_key in seen_telemetry:
-                continue
-            seen_telemetry.add(dedup_key)
-            _record(t.node_num, t.telemetry_type.value, t.received_at.hour)
-
-    # Query traceroutes if enabled
-    if include_traceroute:
-        traceroute_result = await db.execute(
-            select(Traceroute).where(Traceroute.received_at >= cutoff)
-        )
-        traceroute_rows = traceroute_result.scalars().all()
-
-        seen_traceroutes: set[tuple] = set()
-        for tr in traceroute_rows:
-            # Exclude MeshMonitor internal traceroutes (both nodes local)
-            if tr.source_id in meshmonitor_local_nodes:
-                local_nums = meshmonitor_local_nodes[tr.source_id]
-                if tr.from_node_num in local_nums and tr.to_node_num in local_nums:
-                    continue
-            if exclude_local_nodes and (tr.source_id, tr.from_node_num) in local_nodes:
-                continue
-            # Dedup: prefer meshtastic_id, fall back to timestamp-based key
-            if tr.meshtastic_id is not None:
-                dedup_key = (tr.from_node_num, tr.meshtastic_id)
-            else:
-                dedup_key = (tr.from_node_num, tr.to_node_num, tr.received_at)
-            if dedup_key in seen_traceroutes:
-                continue
-            seen_traceroutes.add(dedup_key)
-            _record(tr.from_node_num, "traceroute", tr.received_at.hour)
-
-    # Query packet records (encrypted, unknown, nodeinfo) if any are enabled
+    # Build packet record (encrypted, unknown, nodeinfo) type filters
     packet_record_types = []
     if include_nodeinfo:
         packet_record_types.append(PacketRecordType.NODEINFO)
@@ -2254,82 +2656,89 @@ async def analyze_message_utilization(
     if include_unknown:
         packet_record_types.append(PacketRecordType.UNKNOWN)
 
-    if packet_record_types:
-        pr_result = await db.execute(
-            select(PacketRecord)
-            .where(PacketRecord.received_at >= cutoff)
-            .where(PacketRecord.packet_type.in_(packet_record_types))
+    # Local-node exclusions are applied in SQL before dedup
+    local_pairs = list(local_nodes)
+    meshmonitor_pairs = [
+        (source_id, node_num)
+        for source_id, nums in meshmonitor_local_nodes.items()
+        for node_num in nums
+    ]
+
+    packet_counts = _message_utilization_stmt(
+        include_text=include_text,
+        include_telemetry=bool(telemetry_types),
+        include_traceroute=include_traceroute,
+        include_packet_records=bool(packet_record_types),
+        exclude_local=exclude_local_nodes and bool(local_pairs),
+        exclude_meshmonitor=bool(meshmonitor_pairs),
+    )
+    packet_rows = await _fetch_rows(
+        session_factory,
+        packet_counts,
+        _message_utilization_params(
+            cutoff, telemetry_types, packet_record_types, local_pairs, meshmonitor_pairs
+        ),
+    )
+
+    for row in packet_rows:
+        _record(row.node_num, row.type_key, int(row.hour), row.count)
+
+    # Calculate top 10 nodes by total message count; only the winners
+    # get their response dicts built
+    top_counts = heapq.nlargest(
+        10, node_counts.items(), key=lambda item: sum(item[1].values())
+    )
+
+    # Resolve display names for the top nodes only
+    node_names: dict[int, str] = {}
+    if top_counts:
+        name_rows = await _fetch_rows(
+            session_factory,
+            select(Node.node_num, Node.long_name, Node.short_name).where(
+                Node.node_num.in_([node_num for node_num, _ in top_counts])
+            ),
         )
-        pr_rows = pr_result.scalars().all()
-
-        seen_packets: set[tuple] = set()
-        for pr in pr_rows:
-            # Exclude MeshMonitor internal packets (both nodes local) — only if to_node is set
-            if pr.to_node_num is not None and pr.source_id in meshmonitor_local_nodes:
-                local_nums = meshmonitor_local_nodes[pr.source_id]
-                if pr.from_node_num in local_nums and pr.to_node_num in local_nums:
-                    continue
-            if exclude_local_nodes and (pr.source_id, pr.from_node_num) in local_nodes:
-                continue
-            # Dedup: prefer meshtastic_id, fall back to timestamp-based key
-            if pr.meshtastic_id is not None:
-                dedup_key = (pr.from_node_num, pr.meshtastic_id)
-            else:
-                dedup_key = (pr.from_node_num, pr.packet_type, pr.received_at)
-            if dedup_key in seen_packets:
-                continue
-            seen_packets.add(dedup_key)
-            _record(pr.from_node_num, pr.packet_type.value, pr.received_at.hour)
-
-    # Calculate top 10 nodes by total message count
-    node_totals = []
-    for node_num, type_counts in node_counts.items():
-        total = sum(type_counts.values())
-        node_totals.append({
+        for node in name_rows:
+            if node.long_name:
+                node_names[node.node_num] = node.long_name
+            elif node.short_name:
+                node_names[node.node_num] = node.short_name
+
+    top_nodes = [
+        {
             "node_num": node_num,
-            "node_name": node_names.get(node_num, f"!{node_num:08x}"),
-            "total": total,
+            "node_name": node_names.get(node_num) or _hex_node_id(node_num),
+            "total": sum(type_counts.values()),
             "breakdown": dict(type_counts),
-        })
-
-    node_totals.sort(key=lambda x: x["total"], reverse=True)
-    top_nodes = node_totals[:10]
+        }
+        for node_num, type_counts in top_counts
+    ]
 
     # Build hourly histogram
-    hourly_histogram = []
-    for hour in range(24):
-        type_counts = hourly_counts.get(hour, {})
-        hourly_histogram.append({
+    hourly_histogram = [
+        {
             "hour": hour,
             "total": sum(type_counts.values()),
             "breakdown": dict(type_counts),
-        })
+        }
+        for hour, type_counts in enumerate(hourly_counts)
+    ]
 
     # Calculate total messages
     total_messages = sum(type_totals.values())
 
-    return {
+    body = orjson.dumps({
         "lookback_days": lookback_days,
         "total_messages": total_messages,
         "total_nodes": len(node_counts),
         "type_breakdown": dict(type_totals),
         "top_nodes": top_nodes,
         "hourly_histogram": hourly_histogram,
-        "filters": {
-            "text": include_text,
-            "device": include_device,
-            "environment": include_environment,
-            "power": include_power,
-            "position": include_position,
-            "air_quality": include_air_quality,
-            "traceroute": include_traceroute,
-            "nodeinfo": include_nodeinfo,
-            "encrypted": include_encrypted,
-            "unknown": include_unknown,
-            "exclude_local_nodes": exclude_local_nodes,
-        },
+        "filters": filters,
         "local_nodes_excluded": len(local_nodes) if exclude_local_nodes else 0,
-    }
+    })
+    _message_utilization_cache.set(cache_key, body)
+    return ORJSONResponse(body)
 
 
 # Data retention settings
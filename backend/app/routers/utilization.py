@@ -247,12 +247,12 @@ async def generate_utilization(
 
     # Get channel utilization telemetry
     util_query = (
-        select(Telemetry)
+        select(Telemetry.node_num, Telemetry.channel_utilization)
         .where(Telemetry.received_at >= cutoff)
         .where(Telemetry.channel_utilization.isnot(None))
     )
     util_result = await db.execute(util_query)
-    util_records = util_result.scalars().all()
+    util_records = util_result.all()
 
     if not util_records:
         return GenerateResponse(
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, text
 
 from app.database import async_session_maker
 from app.models import Message, SystemSetting, Telemetry, Traceroute
@@ -75,6 +75,25 @@ async def cleanup_old_data() -> dict[str, int]:
     return deleted
 
 
+async def refresh_solar_daily() -> None:
+    """Rebuild the solar_daily view from the telemetry that remains."""
+    async with async_session_maker() as db:
+        populated = (
+            await db.execute(
+                text("SELECT ispopulated FROM pg_matviews WHERE matviewname = 'solar_daily'")
+            )
+        ).scalar()
+        if populated:
+            # CONCURRENTLY keeps the view readable by solar analysis while it rebuilds
+            await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY solar_daily"))
+        else:
+            # The migration creates the view empty, and CONCURRENTLY cannot
+            # fill an unpopulated view, so the first refresh is a plain one
+            await db.execute(text("REFRESH MATERIALIZED VIEW solar_daily"))
+        await db.commit()
+    logger.info("Refreshed solar_daily materialized view")
+
+
 class RetentionService:
     """Background service for data retention cleanup."""
 
@@ -100,6 +119,11 @@ class RetentionService:
             except Exception as e:
                 logger.error(f"Retention cleanup error: {e}")
 
+            try:
+                await refresh_solar_daily()
+            except Exception as e:
+                logger.error(f"solar_daily refresh error: {e}")
+
             await asyncio.sleep(self._interval)
 
     async def stop(self) -> None:
@@ -238,6 +238,12 @@ CAMEL_TO_METRIC: dict[str, str] = {
 }
 """Map from camelCase protobuf field names to snake_case metric names."""
 
+METRIC_NAME_ALIASES: dict[str, frozenset[str]] = {
+    m.name: frozenset({m.name} | {camel for camel, snake in CAMEL_TO_METRIC.items() if snake == m.name})
+    for m in _METRICS
+}
+"""Map from snake_case metric name to every metric_name it may be stored under."""
+
 
 # ---------------------------------------------------------------------------
 # Sub-message key → TelemetryType mapping
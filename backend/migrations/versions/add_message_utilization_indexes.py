@@ -0,0 +1,40 @@
+"""Add covering (received_at, type) indexes for message utilization analysis.
+
+Revision ID: c3d4e5f6g7h8
+Revises: b2c3d4e5f6g7
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision: str = "c3d4e5f6g7h8"
+down_revision: str = "b2c3d4e5f6g7"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # INCLUDE the columns the utilization aggregates read so Postgres can
+    # answer them with index-only scans. IF NOT EXISTS for crash-recovery
+    # idempotency.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_telemetry_received_type
+            ON telemetry (received_at, telemetry_type)
+            INCLUDE (node_num, source_id, meshtastic_id, metric_name);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_traceroutes_received_covering
+            ON traceroutes (received_at)
+            INCLUDE (from_node_num, to_node_num, source_id, meshtastic_id);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_packet_records_received_type
+            ON packet_records (received_at, packet_type)
+            INCLUDE (from_node_num, to_node_num, source_id, meshtastic_id);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_packet_records_received_type;")
+    op.execute("DROP INDEX IF EXISTS ix_traceroutes_received_covering;")
+    op.execute("DROP INDEX IF EXISTS ix_telemetry_received_type;")
@@ -0,0 +1,26 @@
+"""Add (node_num, last_heard) index on nodes.
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision: str = "e5f6g7h8i9j0"
+down_revision: str = "d4e5f6g7h8i9"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # uq_nodes_source_node leads with source_id, so lookups by node_num alone
+    # had no usable index. IF NOT EXISTS for crash-recovery idempotency.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_nodes_node_num_last_heard
+            ON nodes (node_num, last_heard DESC NULLS LAST);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_nodes_node_num_last_heard;")
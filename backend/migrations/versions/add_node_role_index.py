@@ -0,0 +1,27 @@
+"""Add partial index on nodes.role.
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision: str = "f6g7h8i9j0k1"
+down_revision: str = "e5f6g7h8i9j0"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # Lets /nodes/roles group and sort the handful of distinct roles from an
+    # index-only scan. IF NOT EXISTS for crash-recovery idempotency.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_nodes_role
+            ON nodes (role)
+            WHERE role IS NOT NULL;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_nodes_role;")
@@ -0,0 +1,29 @@
+"""Add partial covering index for position history.
+
+Revision ID: d4e5f6g7h8i9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision: str = "d4e5f6g7h8i9"
+down_revision: str = "c3d4e5f6g7h8"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # Only position rows carry both coordinates, so a partial index keeps
+    # this small while covering every column /position-history returns.
+    # IF NOT EXISTS for crash-recovery idempotency.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_telemetry_position_received
+            ON telemetry (received_at)
+            INCLUDE (node_num, latitude, longitude)
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_telemetry_position_received;")
@@ -0,0 +1,52 @@
+"""Add solar_daily materialized view of per-day metric ranges.
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision: str = "h8i9j0k1l2m3"
+down_revision: str = "g7h8i9j0k1l2"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # One row per node, UTC day and metric (battery, voltage or an INA
+    # chVoltage channel) with the reading count and value range. The solar
+    # analysis uses it to skip nodes whose days never vary enough to show a
+    # charging pattern. Created empty so the migration does not aggregate
+    # the whole telemetry table during startup; the retention job fills it
+    # on its first run and refreshes it daily after that.
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS solar_daily AS
+        SELECT
+            t.node_num,
+            date_trunc('day', t.received_at, 'UTC') AS day,
+            m.metric,
+            count(*) AS readings,
+            min(m.value) AS min_value,
+            max(m.value) AS max_value
+        FROM telemetry t
+        CROSS JOIN LATERAL (
+            VALUES
+                ('battery', t.battery_level::double precision),
+                ('voltage', t.voltage),
+                (CASE WHEN t.metric_name LIKE '%Voltage' THEN t.metric_name END, t.raw_value)
+        ) AS m (metric, value)
+        WHERE m.metric IS NOT NULL AND m.value IS NOT NULL
+        GROUP BY t.node_num, day, m.metric
+        WITH NO DATA;
+    """)
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_solar_daily_node_day_metric
+            ON solar_daily (node_num, day, metric);
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_solar_daily_day ON solar_daily (day);")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS solar_daily;")
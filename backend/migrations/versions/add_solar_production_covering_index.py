@@ -0,0 +1,28 @@
+"""Add covering index for hourly solar production averages.
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision: str = "i9j0k1l2m3n4"
+down_revision: str = "h8i9j0k1l2m3"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # The hourly /solar aggregation and its ETag version query only read
+    # these columns for a timestamp range, so both become index-only scans.
+    # IF NOT EXISTS for crash-recovery idempotency.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_solar_production_timestamp_source
+            ON solar_production (timestamp, source_id)
+            INCLUDE (watt_hours, received_at);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_solar_production_timestamp_source;")
@@ -0,0 +1,28 @@
+"""Add covering (node_num, received_at) index on telemetry.
+
+Revision ID: g7h8i9j0k1l2
+Revises: f6g7h8i9j0k1
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision: str = "g7h8i9j0k1l2"
+down_revision: str = "f6g7h8i9j0k1"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # Per-node telemetry and history endpoints filter on node_num and a
+    # received_at window; INCLUDE the columns history reads so metric
+    # lookups avoid heap fetches. IF NOT EXISTS for crash-recovery idempotency.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_telemetry_node_received
+            ON telemetry (node_num, received_at)
+            INCLUDE (source_id, metric_name, raw_value);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_telemetry_node_received;")
@@ -0,0 +1,123 @@
+"""Tests for the in-process TTL cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_missing_returns_none(self):
+        """Unknown keys should return None."""
+        cache = TTLCache(ttl=60)
+        assert cache.get("missing") is None
+
+    def test_set_then_get(self):
+        """Stored values should be returned before expiry."""
+        cache = TTLCache(ttl=60)
+        cache.set(("solar", 168), b"[]")
+        assert cache.get(("solar", 168)) == b"[]"
+
+    def test_entry_expires_after_ttl(self):
+        """Entries should be dropped once the TTL has elapsed."""
+        cache = TTLCache(ttl=60)
+        with patch("app.cache.time.monotonic", return_value=1000.0):
+            cache.set("key", "value")
+        with patch("app.cache.time.monotonic", return_value=1059.0):
+            assert cache.get("key") == "value"
+        with patch("app.cache.time.monotonic", return_value=1060.0):
+            assert cache.get("key") is None
+
+    def test_oldest_entry_evicted_when_full(self):
+        """Inserting past maxsize should evict the oldest entry."""
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+    def test_overwrite_does_not_evict(self):
+        """Updating an existing key should not evict other entries."""
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)
+        assert cache.get("a") == 10
+        assert cache.get("b") == 2
+
+    def test_clear(self):
+        """clear() should drop every entry."""
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1)
+        cache.clear()
+        assert cache.get("a") is None
+
+
+class TestPublicSourcesCache:
+    """Tests for the cached public source list."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_poll_skips_database_until_cleared(self):
+        """A cached list is served without querying until sources change."""
+        from starlette.requests import Request
+
+        from app.cache import clear_public_sources_cache
+        from app.models.source import SourceType
+        from app.routers.ui import list_sources_public
+
+        request = Request({"type": "http", "method": "GET", "path": "/api/sources", "headers": []})
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.return_value = [("src-1", "Home", SourceType.MQTT, True, None)]
+
+        clear_public_sources_cache()
+        try:
+            first = await list_sources_public(request=request, db=db, _access=None)
+            second = await list_sources_public(request=request, db=db, _access=None)
+            db.execute.assert_awaited_once()
+
+            clear_public_sources_cache()
+            await list_sources_public(request=request, db=db, _access=None)
+        finally:
+            clear_public_sources_cache()
+
+        assert db.execute.await_count == 2
+        assert second.body == first.body
+        assert second.headers["etag"] == first.headers["etag"]
+        assert orjson.loads(first.body) == [
+            {"id": "src-1", "name": "Home", "type": "mqtt", "enabled": True, "healthy": True}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_source_delete_clears_cache_after_commit(self):
+        """The cache is cleared only once the deletion is committed."""
+        from unittest.mock import MagicMock
+
+        from app.cache import public_sources_cache
+        from app.routers.sources import delete_source
+
+        events = []
+        lookup = MagicMock()
+        lookup.scalar.return_value = object()
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.return_value = lookup
+        db.commit.side_effect = lambda: events.append(("commit", public_sources_cache.get("sources")))
+
+        public_sources_cache.set("sources", ("etag", b"[]"))
+        try:
+            with patch("app.routers.sources.collector_manager") as manager:
+                manager.remove_source = AsyncMock()
+                await delete_source(source_id="src-1", db=db, _admin=None)
+            cached_after = public_sources_cache.get("sources")
+        finally:
+            public_sources_cache.clear()
+
+        # Still cached while committing, cleared afterwards
+        assert events == [("commit", ("etag", b"[]"))]
+        assert cached_after is None
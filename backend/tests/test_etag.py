@@ -0,0 +1,63 @@
+"""Tests for the weak ETag helpers."""
+
+from datetime import UTC, datetime
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.etag import CACHE_CONTROL, not_modified, set_etag, weak_etag
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestWeakEtag:
+    """Tests for weak_etag."""
+
+    def test_stable_for_equal_parts(self):
+        """The same version parts should always produce the same tag."""
+        stamp = datetime(2024, 1, 1, tzinfo=UTC)
+        assert weak_etag(None, 10, stamp) == weak_etag(None, 10, stamp)
+        assert weak_etag(None, 10, stamp).startswith('W/"')
+
+    def test_changes_with_parts(self):
+        """Any changed part should produce a different tag."""
+        assert weak_etag("src-a", 10) != weak_etag("src-a", 11)
+        assert weak_etag("src-a", 10) != weak_etag("src-b", 10)
+
+
+class TestNotModified:
+    """Tests for not_modified."""
+
+    def test_no_header_returns_none(self):
+        """Requests without If-None-Match should get the full response."""
+        assert not_modified(_request(), weak_etag(1)) is None
+
+    def test_matching_tag_returns_304(self):
+        """A matching tag should short-circuit with a 304 carrying the ETag."""
+        etag = weak_etag(1)
+        response = not_modified(_request(etag), etag)
+        assert response is not None
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == CACHE_CONTROL
+
+    def test_strong_form_and_lists_match(self):
+        """Weak comparison ignores the W/ prefix and accepts tag lists."""
+        etag = weak_etag(1)
+        assert not_modified(_request(f'"other", {etag.removeprefix("W/")}'), etag) is not None
+        assert not_modified(_request("*"), etag) is not None
+
+    def test_stale_tag_returns_none(self):
+        """A tag from an older version should not match."""
+        assert not_modified(_request(weak_etag(1)), weak_etag(2)) is None
+
+
+def test_set_etag_adds_revalidation_headers():
+    """Full responses should carry the ETag and a no-cache directive."""
+    response = Response()
+    set_etag(response, weak_etag(1))
+    assert response.headers["etag"] == weak_etag(1)
+    assert response.headers["cache-control"] == CACHE_CONTROL
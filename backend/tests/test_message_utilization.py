@@ -0,0 +1,269 @@
+"""Tests for the message utilization analysis query helpers."""
+
+import itertools
+from collections import Counter
+from datetime import UTC, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Message, Node, PacketRecord, Source, Telemetry, Traceroute
+from app.models.packet_record import PacketRecordType
+from app.models.source import SourceType
+from app.models.telemetry import TelemetryType
+from app.routers.ui import (
+    _count_packets_by_hour,
+    _fetch_rows,
+    _message_utilization_params,
+    _message_utilization_stmt,
+)
+
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestCountPacketsByHour:
+    """Tests for the (node, type, hour) aggregation wrapper."""
+
+    def test_groups_by_node_type_and_utc_hour(self):
+        """Packets with a type_key column are grouped by node, type and hour."""
+        packets = select(
+            Telemetry.node_num.label("node_num"),
+            func.min(Telemetry.telemetry_type).label("type_key"),
+            func.min(Telemetry.received_at).label("received_at"),
+        ).group_by(Telemetry.node_num, Telemetry.meshtastic_id)
+
+        stmt = _count_packets_by_hour(packets)
+
+        assert [c.key for c in stmt.selected_columns] == ["node_num", "type_key", "hour", "count"]
+        sql = _compile(stmt)
+        assert "timezone('UTC'" in sql
+        assert sql.rstrip().endswith(
+            "GROUP BY anon_1.node_num, anon_1.type_key, "
+            "EXTRACT(hour FROM timezone('UTC', anon_1.received_at))"
+        )
+
+    def test_type_key_is_optional(self):
+        """Single-type sources such as traceroutes group by node and hour only."""
+        packets = select(
+            Traceroute.from_node_num.label("node_num"),
+            func.min(Traceroute.received_at).label("received_at"),
+        ).group_by(Traceroute.from_node_num, Traceroute.meshtastic_id)
+
+        stmt = _count_packets_by_hour(packets)
+
+        assert [c.key for c in stmt.selected_columns] == ["node_num", "hour", "count"]
+
+
+@pytest.mark.integration
+class TestCountPacketsByHourQuery:
+    """Runs the hourly aggregation and _fetch_rows against seeded PostgreSQL rows."""
+
+    async def test_matches_python_hour_counts(self, test_engine):
+        """SQL buckets equal the original per-row UTC ``received_at.hour`` counts."""
+        session_factory = async_sessionmaker(test_engine, expire_on_commit=False)
+        source_id = str(uuid4())
+        base = datetime(2024, 6, 1, tzinfo=UTC)
+        received = [
+            base,
+            base + timedelta(minutes=59, seconds=59, microseconds=999_999),
+            base + timedelta(hours=1),
+            base + timedelta(hours=23, minutes=30),
+            base + timedelta(days=1, hours=23, minutes=59),
+            # A non-UTC offset must still land in its UTC hour
+            datetime(2024, 6, 2, 3, 15, tzinfo=timezone(timedelta(hours=5))),
+        ]
+        rows = [(node_num, at) for node_num in (1, 2) for at in received[node_num - 1:]]
+        async with session_factory() as session:
+            session.add(Source(id=source_id, name="MQTT", type=SourceType.MQTT))
+            await session.flush()
+            session.add_all([
+                Telemetry(
+                    source_id=source_id,
+                    node_num=node_num,
+                    telemetry_type=TelemetryType.DEVICE,
+                    received_at=at,
+                )
+                for node_num, at in rows
+            ])
+            await session.commit()
+
+        packets = select(
+            Telemetry.node_num.label("node_num"),
+            Telemetry.received_at.label("received_at"),
+        ).where(Telemetry.source_id == source_id)
+        result = await _fetch_rows(session_factory, _count_packets_by_hour(packets))
+
+        expected = Counter((node_num, at.astimezone(UTC).hour) for node_num, at in rows)
+        assert {(row.node_num, int(row.hour)): row.count for row in result} == expected
+
+
+class TestFetchRows:
+    """Tests for running a statement on its own session."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_query_skips_session(self):
+        """A None statement returns no rows without opening a session."""
+        session_factory = MagicMock()
+
+        assert await _fetch_rows(session_factory, None) == []
+        session_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_runs_statement_on_new_session(self):
+        """Rows come from a session opened just for this statement."""
+        session = AsyncMock()
+        session.execute.return_value.all = MagicMock(return_value=[(1,), (2,)])
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = session
+
+        stmt = select(Telemetry.node_num)
+        rows = await _fetch_rows(session_factory, stmt)
+
+        assert rows == [(1,), (2,)]
+        session.execute.assert_awaited_once_with(stmt, None)
+
+
+class TestMessageUtilizationStmt:
+    """Tests for the cached, parameterized utilization aggregate."""
+
+    def _params(self, pairs):
+        return _message_utilization_params(
+            datetime(2024, 1, 1, tzinfo=UTC),
+            [TelemetryType.DEVICE],
+            [PacketRecordType.NODEINFO],
+            pairs,
+            pairs,
+        )
+
+    def test_statement_is_built_once_per_flag_combination(self):
+        """Repeated calls with the same flags reuse one statement object."""
+        first = _message_utilization_stmt(True, True, True, True, False, True)
+        assert _message_utilization_stmt(True, True, True, True, False, True) is first
+        assert _message_utilization_stmt(True, True, True, True, True, True) is not first
+
+    def test_all_sources_disabled_returns_none(self):
+        """No statement is built when every source is filtered out."""
+        assert _message_utilization_stmt(False, False, False, False, True, True) is None
+
+    def test_params_bind_every_combination(self):
+        """Every flag combination compiles with the shared parameter dict."""
+        params = self._params([("src-a", 1), ("src-b", 2)])
+        for flags in itertools.product([False, True], repeat=6):
+            stmt = _message_utilization_stmt(*flags)
+            if stmt is None:
+                continue
+            sql = str(
+                stmt.params(**params).compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"render_postcompile": True},
+                )
+            )
+            assert "POSTCOMPILE" not in sql, flags
+            assert sql.count("UNION ALL") == sum(flags[:4]) - 1, flags
+
+    def test_local_pair_checks_are_null_safe(self):
+        """Pair lookups use EXISTS, which never turns a NULL node into a NULL predicate."""
+        sql = _compile(_message_utilization_stmt(True, True, True, True, True, True))
+
+        assert "NOT (EXISTS (SELECT *" in sql
+        assert ") NOT IN (SELECT" not in sql
+
+
+def _at(hour: int, minute: int = 0, microsecond: int = 0) -> datetime:
+    return datetime(2024, 6, 1, hour, minute, 0, microsecond, tzinfo=UTC)
+
+
+@pytest.mark.integration
+class TestMessageUtilizationQuery:
+    """Runs the utilization aggregate against seeded PostgreSQL rows."""
+
+    async def _seed(self, session_factory) -> tuple[list, list]:
+        meshmonitor, mqtt = str(uuid4()), str(uuid4())
+        async with session_factory() as session:
+            session.add_all([
+                Source(id=meshmonitor, name="MeshMonitor", type=SourceType.MESHMONITOR),
+                Source(id=mqtt, name="MQTT", type=SourceType.MQTT),
+            ])
+            await session.flush()
+            session.add_all([
+                # Nodes 1 and 2 are local to the MeshMonitor source; node 3 is remote
+                Node(source_id=meshmonitor, node_num=1, hops_away=0),
+                Node(source_id=meshmonitor, node_num=2, hops_away=0),
+                Node(source_id=mqtt, node_num=3, hops_away=2),
+                # Same text packet heard by both sources: counted once
+                Message(source_id=meshmonitor, from_node_num=3, to_node_num=1, meshtastic_id=100, received_at=_at(10, 5)),
+                Message(source_id=mqtt, from_node_num=3, to_node_num=1, meshtastic_id=100, received_at=_at(10, 6)),
+                # No meshtastic_id: never matched, so each counts
+                Message(source_id=mqtt, from_node_num=3, to_node_num=1, received_at=_at(11)),
+                Message(source_id=mqtt, from_node_num=3, to_node_num=1, received_at=_at(11)),
+                # Broadcasts have no destination and are never internal
+                Message(source_id=meshmonitor, from_node_num=3, meshtastic_id=101, received_at=_at(11, 30)),
+                Message(source_id=meshmonitor, from_node_num=1, meshtastic_id=103, received_at=_at(12)),
+                # Between two local nodes of one MeshMonitor source: internal
+                Message(source_id=meshmonitor, from_node_num=1, to_node_num=2, meshtastic_id=102, received_at=_at(12)),
+                # Metric rows of one packet without an id, milliseconds apart
+                Telemetry(source_id=mqtt, node_num=3, telemetry_type=TelemetryType.DEVICE,
+                          metric_name="batteryLevel", received_at=_at(13, 0, 100_000)),
+                Telemetry(source_id=mqtt, node_num=3, telemetry_type=TelemetryType.DEVICE,
+                          metric_name="voltage", received_at=_at(13, 0, 400_000)),
+                Telemetry(source_id=meshmonitor, node_num=3, telemetry_type=TelemetryType.DEVICE,
+                          meshtastic_id=200, received_at=_at(13, 10)),
+                Telemetry(source_id=mqtt, node_num=3, telemetry_type=TelemetryType.DEVICE,
+                          meshtastic_id=200, received_at=_at(13, 11)),
+                Traceroute(source_id=meshmonitor, from_node_num=3, to_node_num=1, meshtastic_id=300, received_at=_at(9)),
+                Traceroute(source_id=mqtt, from_node_num=3, to_node_num=1, meshtastic_id=300, received_at=_at(9, 1)),
+                Traceroute(source_id=meshmonitor, from_node_num=1, to_node_num=2, received_at=_at(9)),
+                PacketRecord(source_id=mqtt, from_node_num=3, packet_type=PacketRecordType.ENCRYPTED, received_at=_at(14)),
+                PacketRecord(source_id=meshmonitor, from_node_num=1, to_node_num=2,
+                             packet_type=PacketRecordType.NODEINFO, received_at=_at(14)),
+            ])
+            await session.commit()
+        local_pairs = [(meshmonitor, 1), (meshmonitor, 2)]
+        return local_pairs, local_pairs
+
+    async def _counts(self, session_factory, exclude_local: bool, local_pairs, meshmonitor_pairs) -> dict:
+        rows = await _fetch_rows(
+            session_factory,
+            _message_utilization_stmt(True, True, True, True, exclude_local, True),
+            _message_utilization_params(
+                datetime(2024, 6, 1, tzinfo=UTC),
+                list(TelemetryType),
+                list(PacketRecordType),
+                local_pairs,
+                meshmonitor_pairs,
+            ),
+        )
+        return {(row.node_num, row.type_key, int(row.hour)): row.count for row in rows}
+
+    async def test_dedups_packets_and_keeps_broadcasts(self, test_engine):
+        """Duplicates count once; packets with NULL ids or destinations are kept."""
+        session_factory = async_sessionmaker(test_engine, expire_on_commit=False)
+        local_pairs, meshmonitor_pairs = await self._seed(session_factory)
+
+        assert await self._counts(session_factory, False, local_pairs, meshmonitor_pairs) == {
+            (3, "traceroute", 9): 1,
+            (3, "text", 10): 1,
+            (3, "text", 11): 3,
+            (1, "text", 12): 1,
+            (3, "device", 13): 2,
+            (3, "encrypted", 14): 1,
+        }
+
+    async def test_exclude_local_drops_only_local_senders(self, test_engine):
+        """Local senders are dropped; everything else is counted as before."""
+        session_factory = async_sessionmaker(test_engine, expire_on_commit=False)
+        local_pairs, meshmonitor_pairs = await self._seed(session_factory)
+
+        assert await self._counts(session_factory, True, local_pairs, meshmonitor_pairs) == {
+            (3, "traceroute", 9): 1,
+            (3, "text", 10): 1,
+            (3, "text", 11): 3,
+            (3, "device", 13): 2,
+            (3, "encrypted", 14): 1,
+        }
@@ -34,13 +34,103 @@ def test_set_missing_server_defaults_revision_exists():
     )
 
 
-def test_add_meshtastic_id_columns_is_head():
-    """The add_meshtastic_id_columns migration should be the current head."""
+def test_add_meshtastic_id_columns_revision_exists():
+    """The add_meshtastic_id_columns migration exists and chains correctly."""
     cfg = _get_alembic_cfg()
     script_dir = ScriptDirectory.from_config(cfg)
 
+    rev = script_dir.get_revision("b2c3d4e5f6g7")
+    assert rev is not None, "Revision b2c3d4e5f6g7 not found"
+    assert rev.down_revision == "x7y8z9a0b1c2", (
+        f"Expected down_revision 'x7y8z9a0b1c2', got '{rev.down_revision}'"
+    )
+
+
+def test_add_message_utilization_indexes_revision_exists():
+    """The add_message_utilization_indexes migration exists and chains correctly."""
+    cfg = _get_alembic_cfg()
+    script_dir = ScriptDirectory.from_config(cfg)
+
+    rev = script_dir.get_revision("c3d4e5f6g7h8")
+    assert rev is not None, "Revision c3d4e5f6g7h8 not found"
+    assert rev.down_revision == "b2c3d4e5f6g7", (
+        f"Expected down_revision 'b2c3d4e5f6g7', got '{rev.down_revision}'"
+    )
+
+
+def test_add_position_history_index_revision_exists():
+    """The add_position_history_index migration exists and chains correctly."""
+    cfg = _get_alembic_cfg()
+    script_dir = ScriptDirectory.from_config(cfg)
+
+    rev = script_dir.get_revision("d4e5f6g7h8i9")
+    assert rev is not None, "Revision d4e5f6g7h8i9 not found"
+    assert rev.down_revision == "c3d4e5f6g7h8", (
+        f"Expected down_revision 'c3d4e5f6g7h8', got '{rev.down_revision}'"
+    )
+
+
+def test_add_node_num_last_heard_index_revision_exists():
+    """The add_node_num_last_heard_index migration exists and chains correctly."""
+    cfg = _get_alembic_cfg()
+    script_dir = ScriptDirectory.from_config(cfg)
+
+    rev = script_dir.get_revision("e5f6g7h8i9j0")
+    assert rev is not None, "Revision e5f6g7h8i9j0 not found"
+    assert rev.down_revision == "d4e5f6g7h8i9", (
+        f"Expected down_revision 'd4e5f6g7h8i9', got '{rev.down_revision}'"
+    )
+
+
+def test_add_node_role_index_revision_exists():
+    """The add_node_role_index migration exists and chains correctly."""
+    cfg = _get_alembic_cfg()
+    script_dir = ScriptDirectory.from_config(cfg)
+
+    rev = script_dir.get_revision("f6g7h8i9j0k1")
+    assert rev is not None, "Revision f6g7h8i9j0k1 not found"
+    assert rev.down_revision == "e5f6g7h8i9j0", (
+        f"Expected down_revision 'e5f6g7h8i9j0', got '{rev.down_revision}'"
+    )
+
+
+def test_add_telemetry_node_received_index_revision_exists():
+    """The add_telemetry_node_received_index migration exists and chains correctly."""
+    cfg = _get_alembic_cfg()
+    script_dir = ScriptDirectory.from_config(cfg)
+
+    rev = script_dir.get_revision("g7h8i9j0k1l2")
+    assert rev is not None, "Revision g7h8i9j0k1l2 not found"
+    assert rev.down_revision == "f6g7h8i9j0k1", (
+        f"Expected down_revision 'f6g7h8i9j0k1', got '{rev.down_revision}'"
+    )
+
+
+def test_add_solar_daily_view_revision_exists():
+    """The add_solar_daily_view migration exists and chains correctly."""
+    cfg = _get_alembic_cfg()
+    script_dir = ScriptDirectory.from_config(cfg)
+
+    rev = script_dir.get_revision("h8i9j0k1l2m3")
+    assert rev is not None, "Revision h8i9j0k1l2m3 not found"
+    assert rev.down_revision == "g7h8i9j0k1l2", (
+        f"Expected down_revision 'g7h8i9j0k1l2', got '{rev.down_revision}'"
+    )
+
+
+def test_add_solar_production_covering_index_is_head():
+    """The add_solar_production_covering_index migration should be the current head."""
+    cfg = _get_alembic_cfg()
+    script_dir = ScriptDirectory.from_config(cfg)
+
+    rev = script_dir.get_revision("i9j0k1l2m3n4")
+    assert rev is not None, "Revision i9j0k1l2m3n4 not found"
+    assert rev.down_revision == "h8i9j0k1l2m3", (
+        f"Expected down_revision 'h8i9j0k1l2m3', got '{rev.down_revision}'"
+    )
+
     heads = script_dir.get_heads()
-    assert "b2c3d4e5f6g7" in heads, f"Expected b2c3d4e5f6g7 in heads, got {heads}"
+    assert "i9j0k1l2m3n4" in heads, f"Expected i9j0k1l2m3n4 in heads, got {heads}"
 
 
 def test_model_server_defaults_present():
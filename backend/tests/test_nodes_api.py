@@ -0,0 +1,76 @@
+"""Tests for the node list endpoints' serialized output."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.routers.ui import get_nodes_by_node_num, list_nodes
+from app.schemas.node import NodeSummary
+
+NODE_ROW = {
+    "id": "node-1",
+    "source_id": "src-1",
+    "source_name": "Source 1",
+    "node_num": 305419896,
+    "node_id": "!12345678",
+    "short_name": "N1",
+    "long_name": "Node One",
+    "hw_model": "TBEAM",
+    "role": "CLIENT",
+    "latitude": 40.5,
+    "longitude": -74.25,
+    "snr": 6.5,
+    "rssi": -90,
+    "hops_away": 1,
+    "last_heard": datetime(2026, 1, 1, 12, 30, 15, 250000, tzinfo=UTC),
+}
+
+
+def _rows_result(rows: list[dict]) -> MagicMock:
+    result = MagicMock()
+    result.mappings.return_value = rows
+    return result
+
+
+class TestNodeSummaryOutput:
+    """Node lists must serialize exactly as the NodeSummary model did."""
+
+    @pytest.mark.asyncio
+    async def test_list_nodes_matches_response_model(self):
+        """last_heard keeps the Z suffix pydantic wrote for UTC timestamps."""
+        version = MagicMock()
+        version.one.return_value = (1, NODE_ROW["last_heard"], NODE_ROW["last_heard"])
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.side_effect = [version, _rows_result([NODE_ROW])]
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+        response = await list_nodes(
+            request=request,
+            db=db,
+            source_id=None,
+            active_only=False,
+            active_hours=1,
+            latest_per_node=False,
+            _access=None,
+        )
+
+        assert b'"last_heard":"2026-01-01T12:30:15.250000Z"' in response.body
+        assert orjson.loads(response.body) == [orjson.loads(NodeSummary(**NODE_ROW).model_dump_json())]
+
+    @pytest.mark.asyncio
+    async def test_nodes_by_node_num_matches_response_model(self):
+        """Per-source records for one node serialize like NodeSummary."""
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.return_value = _rows_result([NODE_ROW, {**NODE_ROW, "last_heard": None}])
+
+        response = await get_nodes_by_node_num(node_num=305419896, db=db, _access=None)
+
+        assert orjson.loads(response.body) == [
+            orjson.loads(NodeSummary(**NODE_ROW).model_dump_json()),
+            orjson.loads(NodeSummary(**{**NODE_ROW, "last_heard": None}).model_dump_json()),
+        ]
+        assert orjson.loads(response.body)[0]["last_heard"] == "2026-01-01T12:30:15.250000Z"
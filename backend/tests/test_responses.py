@@ -0,0 +1,77 @@
+"""Tests for custom response classes."""
+
+from datetime import UTC, datetime
+
+import orjson
+import pytest
+
+from app.responses import ORJSONResponse, ORJSONStreamingResponse
+
+
+class TestORJSONResponse:
+    """Tests for ORJSONResponse rendering."""
+
+    def test_renders_json(self):
+        """Plain content should be serialized with orjson."""
+        response = ORJSONResponse([{"timestamp": 1, "wattHours": 2.5}])
+        assert orjson.loads(response.body) == [{"timestamp": 1, "wattHours": 2.5}]
+        assert response.media_type == "application/json"
+
+    def test_renders_datetime_natively(self):
+        """Datetimes should serialize like isoformat(), as jsonable_encoder did."""
+        ts = datetime(2024, 1, 1, 12, 30, tzinfo=UTC)
+        response = ORJSONResponse({"received_at": ts})
+        assert response.body == b'{"received_at":"2024-01-01T12:30:00+00:00"}'
+        assert orjson.loads(response.body) == {"received_at": ts.isoformat()}
+
+    def test_option_adds_utc_z_suffix(self):
+        """Endpoints that returned pydantic models can keep the Z suffix."""
+        ts = datetime(2024, 1, 1, 12, 30, tzinfo=UTC)
+        response = ORJSONResponse({"received_at": ts, 1: "a"}, option=orjson.OPT_UTC_Z)
+        assert response.body == b'{"received_at":"2024-01-01T12:30:00Z","1":"a"}'
+
+    def test_renders_enums_by_value(self):
+        """Enum members should serialize as their value."""
+        from app.models.source import SourceType
+
+        response = ORJSONResponse({"type": SourceType.MQTT})
+        assert orjson.loads(response.body) == {"type": SourceType.MQTT.value}
+
+    def test_prerendered_bytes_pass_through(self):
+        """Cached bytes should be returned without re-encoding."""
+        body = orjson.dumps([1, 2, 3])
+        response = ORJSONResponse(body)
+        assert response.body == body
+
+
+class TestORJSONStreamingResponse:
+    """Tests for batch-by-batch JSON array streaming."""
+
+    @staticmethod
+    async def _body(batches: list[list], option: int = 0) -> bytes:
+        async def source():
+            for batch in batches:
+                yield batch
+
+        response = ORJSONStreamingResponse(source(), option=option)
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    @pytest.mark.asyncio
+    async def test_batches_join_into_one_array(self):
+        """Batches should concatenate into a single valid JSON array."""
+        ts = datetime(2024, 1, 1, 12, 30, tzinfo=UTC)
+        body = await self._body([[{"a": 1}, {"a": 2}], [], [{"received_at": ts}]])
+        assert orjson.loads(body) == [{"a": 1}, {"a": 2}, {"received_at": ts.isoformat()}]
+
+    @pytest.mark.asyncio
+    async def test_no_rows_is_empty_array(self):
+        """A stream with no items should still be a valid empty array."""
+        assert await self._body([]) == b"[]"
+        assert await self._body([[]]) == b"[]"
+
+    @pytest.mark.asyncio
+    async def test_option_applies_to_every_batch(self):
+        """Extra orjson flags should reach each encoded batch."""
+        ts = datetime(2024, 1, 1, 12, 30, tzinfo=UTC)
+        body = await self._body([[{"received_at": ts}], [{"received_at": ts}]], option=orjson.OPT_UTC_Z)
+        assert body == b'[{"received_at":"2024-01-01T12:30:00Z"},{"received_at":"2024-01-01T12:30:00Z"}]'
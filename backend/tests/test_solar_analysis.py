@@ -2,10 +2,42 @@
 
 from collections import defaultdict
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
+import orjson
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.etag import weak_etag
+from app.routers.ui import (
+    _SOLAR_POOL_MAX_WORKERS,
+    _add_solar_readings,
+    _analyze_metric_for_solar_patterns,
+    _analyze_solar_node,
+    _forecast_schedule,
+    _node_display_names,
+    _simulate_first_forecast_day,
+    _simulate_forecast,
+    _solar_analysis_pool,
+    _solar_averages_body,
+    _solar_averages_cache,
+    _solar_daily_ready,
+    _solar_daily_ready_cache,
+    _solar_forecast_cache,
+    _solar_node_candidates,
+    _solar_nodes_cache,
+    _solar_reporting_nodes_stmt,
+    _solar_telemetry_stmt,
+    analyze_solar_forecast,
+    get_solar_averages,
+    identify_solar_nodes,
+    shutdown_solar_analysis_pool,
+)
+from app.services.retention import refresh_solar_daily
 
 
 class TestSolarAnalysisAlgorithm:
@@ -290,6 +322,474 @@ class TestSolarAnalysisEdgeCases:
         assert len(afternoon_values) == 2, "Hours 12 and 18 should be in afternoon window"
 
 
+class TestSimulateFirstForecastDay:
+    """Tests for the first-day battery simulation in the solar forecast."""
+
+    day_forecast = {"date": "2024-06-01", "pct_of_average": 100.0}
+
+    def _simulate(self, now):
+        (day,) = _forecast_schedule([self.day_forecast])
+        battery, min_battery, points = _simulate_first_forecast_day(
+            now,
+            day,
+            battery=np.array([80.0]),
+            min_battery=np.array([80.0]),
+            avg_charge_rate=np.array([5.0]),
+            avg_discharge_rate=np.array([2.0]),
+            avg_charging_hours=np.array([4.0]),
+        )
+        return battery[0], min_battery[0], [
+            {"phase": phase, "simulated_battery": round(levels[0], 1)} for _, phase, _, levels in points
+        ]
+
+    def test_before_sunrise_simulates_all_phases(self):
+        """Before sunrise, discharge until sunrise then run full charge/afternoon phases."""
+        battery, min_battery, points = self._simulate(datetime(2024, 6, 1, 10, 0, tzinfo=UTC))
+
+        assert [p["phase"] for p in points] == ["sunrise", "peak", "sunset"]
+        # 2 hours until 12:00 UTC sunrise at 2%/h
+        assert points[0]["simulated_battery"] == 76.0
+        assert min_battery == 76.0
+        # Full charging phase: 4h at 5%/h
+        assert points[1]["simulated_battery"] == 96.0
+        # Afternoon: 4h * 2%/h * 0.3
+        assert points[2]["simulated_battery"] == 93.6
+        assert battery == pytest.approx(93.6)
+
+    def test_during_charging_only_partial_charge(self):
+        """Between sunrise and peak, only charge for the hours left until peak."""
+        battery, min_battery, points = self._simulate(datetime(2024, 6, 1, 17, 0, tzinfo=UTC))
+
+        assert [p["phase"] for p in points] == ["peak", "sunset"]
+        # 2 hours until 19:00 UTC peak at 5%/h
+        assert points[0]["simulated_battery"] == 90.0
+        assert min_battery == 80.0
+
+    def test_after_peak_only_partial_afternoon_discharge(self):
+        """Between peak and sunset, only discharge for the hours left until sunset."""
+        battery, _, points = self._simulate(datetime(2024, 6, 1, 21, 0, tzinfo=UTC))
+
+        assert [p["phase"] for p in points] == ["sunset"]
+        # 2 hours until 23:00 UTC sunset: 2h * 2%/h * 0.3
+        assert points[0]["simulated_battery"] == 78.8
+
+    def test_after_sunset_no_points(self):
+        """After sunset the day contributes nothing and the battery is unchanged."""
+        battery, min_battery, points = self._simulate(datetime(2024, 6, 1, 23, 30, tzinfo=UTC))
+
+        assert points == []
+        assert battery == 80.0
+        assert min_battery == 80.0
+
+
+class TestSimulateForecast:
+    """Tests for the vectorized multi-node forecast simulation."""
+
+    def test_nodes_are_simulated_independently(self):
+        """Each node's levels match a scalar walk through the same schedule."""
+        schedule = _forecast_schedule([
+            {"date": "2024-06-01", "pct_of_average": 100.0},
+            {"date": "2024-06-02", "pct_of_average": 50.0},
+        ])
+        min_battery, points = _simulate_forecast(
+            datetime(2024, 6, 1, 23, 30, tzinfo=UTC),
+            schedule,
+            battery=np.array([80.0, 30.0]),
+            avg_charge_rate=np.array([5.0, 1.0]),
+            avg_discharge_rate=np.array([2.0, 3.0]),
+            avg_charging_hours=np.array([4.0, 10.0]),
+            avg_discharge_hours=np.array([14.0, 14.0]),
+        )
+
+        assert [(timestamp, phase) for timestamp, phase, _, _ in points] == [
+            ("2024-06-02T12:00:00Z", "sunrise"),
+            ("2024-06-02T19:00:00Z", "peak"),
+            ("2024-06-02T23:00:00Z", "sunset"),
+        ]
+        assert all(factor == 0.5 for _, _, factor, _ in points)
+        # Node 0: 80 - 28 = 52, + 5 * 0.5 * 4 = 62, - 2.4 = 59.6
+        # Node 1: 30 - 42 clips to 0, + 1 * 0.5 * 10 = 5, - 3.6 = 1.4
+        levels = np.array([levels for _, _, _, levels in points])
+        np.testing.assert_allclose(levels, [[52, 0], [62, 5], [59.6, 1.4]])
+        assert min_battery.tolist() == [52, 0]
+
+
+class TestAnalyzeMetricForSolarPatterns:
+    """Tests for the array-based per-day solar pattern analyzer."""
+
+    day = datetime(2024, 6, 1, tzinfo=UTC)
+
+    def _analyze(self, readings, is_battery=True, previous_day_sunset=None):
+        times = [self.day.replace(hour=h) for h, _ in readings]
+        hours = np.array([h for h, _ in readings], dtype=np.int8)
+        values = np.array([v for _, v in readings], dtype=np.float64)
+        return _analyze_metric_for_solar_patterns(times, hours, values, is_battery, previous_day_sunset)
+
+    def test_morning_low_and_afternoon_high(self):
+        """Sunrise is the morning minimum and peak the afternoon maximum."""
+        result = self._analyze([(2, 70), (7, 60), (9, 60), (14, 95), (16, 95), (22, 80)])
+
+        assert result["sunrise"] == {"time": self.day.replace(hour=7), "value": 60.0}
+        assert result["peak"] == {"time": self.day.replace(hour=14), "value": 95.0}
+        assert result["sunset"] == {"time": self.day.replace(hour=22), "value": 80.0}
+        assert result["charge_rate"] == pytest.approx(35 / 7)
+
+    def test_charge_rate_stops_at_first_full_reading(self):
+        """Battery charge rate is measured until the first 100% reading."""
+        result = self._analyze([(8, 60), (11, 100), (15, 100), (20, 90)])
+
+        assert result["peak"]["time"] == self.day.replace(hour=15)
+        assert result["charge_rate"] == pytest.approx(40 / 3)
+
+    def test_wall_power_returns_none(self):
+        """Near-constant readings are not analyzed as solar."""
+        assert self._analyze([(8, 80), (12, 81), (16, 80)]) is None
+
+
+class TestAnalyzeSolarNode:
+    """Tests for the per-node analysis run inline or in worker processes."""
+
+    def _series(self, daily_readings, metric="battery_level"):
+        series = {}
+        for day_offset, readings in enumerate(daily_readings):
+            day = datetime(2024, 6, 1 + day_offset, tzinfo=UTC)
+            for hour, value in readings:
+                telemetry = SimpleNamespace(
+                    received_at=day.replace(hour=hour),
+                    battery_level=value if metric == "battery_level" else None,
+                    voltage=value if metric == "voltage" else None,
+                    metric_name=None,
+                    raw_value=None,
+                    hour=hour,
+                )
+                _add_solar_readings(series, telemetry)
+        return series
+
+    def test_solar_node_returns_candidate(self):
+        """A daily morning-low/afternoon-high cycle yields a candidate."""
+        day = [(2, 70), (7, 60), (9, 60), (14, 95), (16, 95), (22, 80)]
+        candidate, charging_hours, discharge_hours = _analyze_solar_node(self._series([day, day, day]))
+
+        assert candidate["metric_type"] == "battery"
+        assert candidate["solar_score"] == 100.0
+        assert len(candidate["recent_patterns"]) == 3
+        assert len(candidate["chart_data"]) == 18
+        assert charging_hours == [15.0, 15.0, 15.0]
+        assert discharge_hours == [9.0, 9.0]
+
+    def test_chart_data_matches_baseline_rounding(self):
+        """Chart values are rounded per reading, as the original loop did."""
+        battery_day = [(2, 70), (7, 60), (9, 60), (14, 95), (16, 95), (22, 80)]
+        voltage_day = [(2, 3.7005), (7, 3.6035), (9, 3.6045), (14, 4.1075), (16, 4.1085), (22, 3.9005)]
+
+        for metric, day in (("battery_level", battery_day), ("voltage", voltage_day)):
+            candidate, _, _ = _analyze_solar_node(self._series([day, day], metric))
+
+            expected = [
+                {
+                    "timestamp": int(datetime(2024, 6, 1 + offset, hour, tzinfo=UTC).timestamp() * 1000),
+                    "value": round(value, 3),
+                }
+                for offset in range(2)
+                for hour, value in day
+            ]
+            assert candidate["chart_data"] == expected
+            assert [type(point["value"]) for point in candidate["chart_data"]] == [type(v) for _, v in day * 2]
+
+    def test_wall_powered_node_returns_none(self):
+        """Constant readings produce no candidate."""
+        day = [(8, 80), (12, 81), (16, 80)]
+        assert _analyze_solar_node(self._series([day, day])) == (None, [], [])
+
+
+class TestSolarNodeCandidates:
+    """Tests for the solar_daily prefilter on analyzed nodes."""
+
+    def test_filters_on_metric_ranges_and_keeps_recent_nodes(self):
+        """Varying nodes come from the view; recent telemetry bypasses it."""
+        stmt = _solar_node_candidates(datetime(2024, 6, 1, 13, 5, tzinfo=UTC))
+        sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+        assert "solar_daily.day >= '2024-06-01 00:00:00+00:00'" in sql
+        assert "solar_daily.readings >= 3" in sql
+        assert " UNION SELECT telemetry.node_num" in sql
+        assert "coalesce((SELECT max(solar_daily.day)" in sql
+
+    def test_prefilter_is_skipped_while_view_is_unpopulated(self):
+        """Without the prefilter the telemetry query never touches solar_daily."""
+        cutoff = datetime(2024, 6, 1, tzinfo=UTC)
+        compiled = {
+            prefilter: str(_solar_telemetry_stmt(cutoff, prefilter).compile(dialect=postgresql.dialect()))
+            for prefilter in (True, False)
+        }
+
+        assert "solar_daily" in compiled[True]
+        assert "solar_daily" not in compiled[False]
+
+    @pytest.mark.asyncio
+    async def test_view_readiness_is_cached_once_populated(self):
+        """An unpopulated view is re-checked; a populated one is remembered."""
+        unpopulated, populated = MagicMock(), MagicMock()
+        unpopulated.scalar.return_value = False
+        populated.scalar.return_value = True
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.side_effect = [unpopulated, populated]
+
+        _solar_daily_ready_cache.clear()
+        try:
+            assert await _solar_daily_ready(db) is False
+            assert await _solar_daily_ready(db) is True
+            assert await _solar_daily_ready(db) is True
+        finally:
+            _solar_daily_ready_cache.clear()
+
+        assert db.execute.await_count == 2
+
+    def test_reporting_nodes_count_ignores_prefilter(self):
+        """total_nodes_analyzed counts every reporting node, not just candidates."""
+        stmt = _solar_reporting_nodes_stmt(datetime(2024, 6, 1, tzinfo=UTC))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "count(DISTINCT telemetry.node_num)" in sql
+        assert "telemetry.metric_name LIKE" in sql
+        assert "solar_daily" not in sql
+
+    @pytest.mark.asyncio
+    async def test_total_nodes_analyzed_includes_prefiltered_nodes(self):
+        """With the view populated, skipped nodes still count as analyzed."""
+        async def no_rows():
+            return
+            yield
+
+        db = AsyncMock(spec=AsyncSession)
+        db.stream.return_value = no_rows()
+        db.scalar.return_value = 5
+
+        _solar_nodes_cache.clear()
+        try:
+            with (
+                patch("app.routers.ui._solar_daily_ready", AsyncMock(return_value=True)),
+                patch("app.routers.ui._hourly_solar_production", AsyncMock(return_value=[])),
+            ):
+                response = await identify_solar_nodes(db=db, lookback_days=7, _access=None)
+        finally:
+            _solar_nodes_cache.clear()
+
+        data = orjson.loads(response.body)
+        assert data["total_nodes_analyzed"] == 5
+        assert data["solar_nodes_count"] == 0
+
+
+class TestRefreshSolarDaily:
+    """Tests for the retention job's solar_daily refresh."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("populated", "expected"),
+        [
+            (False, "REFRESH MATERIALIZED VIEW solar_daily"),
+            (True, "REFRESH MATERIALIZED VIEW CONCURRENTLY solar_daily"),
+        ],
+    )
+    async def test_first_refresh_fills_unpopulated_view(self, populated, expected):
+        """An empty view is filled with a plain refresh, later ones run concurrently."""
+        status = MagicMock()
+        status.scalar.return_value = populated
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.side_effect = [status, MagicMock()]
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = db
+
+        with patch("app.services.retention.async_session_maker", session_maker):
+            await refresh_solar_daily()
+
+        assert str(db.execute.await_args_list[1].args[0]) == expected
+        db.commit.assert_awaited_once()
+
+
+class TestSolarAnalysisPool:
+    """Tests for the solar analysis worker pool lifecycle."""
+
+    def test_pool_is_bounded_spawned_and_shut_down(self):
+        """Workers are spawned, capped, and the pool is released on shutdown."""
+        pool = _solar_analysis_pool()
+        try:
+            assert pool._max_workers == _SOLAR_POOL_MAX_WORKERS
+            assert pool._mp_context.get_start_method() == "spawn"
+            assert _solar_analysis_pool() is pool
+        finally:
+            shutdown_solar_analysis_pool()
+
+        assert _solar_analysis_pool.cache_info().currsize == 0
+        shutdown_solar_analysis_pool()  # idempotent when never restarted
+
+
+class TestSolarNodesCache:
+    """Tests for the solar-nodes response cache."""
+
+    @pytest.mark.asyncio
+    async def test_cached_body_skips_database(self):
+        """A cached analysis for the same lookback is returned without querying."""
+        _solar_nodes_cache.clear()
+        _solar_nodes_cache.set(7, b'{"solar_nodes":[]}')
+        db = AsyncMock(spec=AsyncSession)
+
+        try:
+            response = await identify_solar_nodes(db=db, lookback_days=7, _access=None)
+        finally:
+            _solar_nodes_cache.clear()
+
+        assert response.body == b'{"solar_nodes":[]}'
+        db.execute.assert_not_awaited()
+
+
+class TestSolarForecastCache:
+    """Tests for the solar-forecast response cache."""
+
+    @pytest.mark.asyncio
+    async def test_cached_body_for_current_hour_skips_database(self):
+        """A forecast cached for this lookback, limit and hour is returned without querying."""
+        hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+        _solar_forecast_cache.clear()
+        _solar_forecast_cache.set((7, None, hour), b'{"nodes_at_risk":[]}')
+        db = AsyncMock(spec=AsyncSession)
+
+        try:
+            response = await analyze_solar_forecast(db=db, lookback_days=7, limit=None, _access=None)
+        finally:
+            _solar_forecast_cache.clear()
+
+        assert response.body == b'{"nodes_at_risk":[]}'
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_no_solar_production_skips_telemetry(self):
+        """Without solar production data the telemetry scan is skipped."""
+        historical = MagicMock()
+        historical.one.return_value = (0, 0, None)
+        forecast = MagicMock()
+        forecast.all.return_value = []
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.side_effect = [historical, forecast]
+
+        _solar_forecast_cache.clear()
+        try:
+            response = await analyze_solar_forecast(db=db, lookback_days=7, limit=None, _access=None)
+        finally:
+            _solar_forecast_cache.clear()
+
+        body = orjson.loads(response.body)
+        assert body["forecast_days"] == []
+        assert body["nodes_at_risk_count"] == 0
+        assert body["solar_simulations"] == []
+        db.stream.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_zero_wh_history_still_scans_telemetry(self):
+        """Historical days that produced 0 Wh are data, so nodes are still analyzed."""
+        historical = MagicMock()
+        historical.one.return_value = (3, 0, None)
+        forecast = MagicMock()
+        forecast.all.return_value = []
+        ready = MagicMock()
+        ready.scalar.return_value = True
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.side_effect = [historical, forecast, ready]
+
+        class NoRows:
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                raise StopAsyncIteration
+
+        db.stream.return_value = NoRows()
+
+        _solar_forecast_cache.clear()
+        _solar_daily_ready_cache.clear()
+        try:
+            await analyze_solar_forecast(db=db, lookback_days=7, limit=None, _access=None)
+        finally:
+            _solar_forecast_cache.clear()
+            _solar_daily_ready_cache.clear()
+
+        db.stream.assert_awaited_once()
+
+
+class TestSolarAveragesEtag:
+    """Tests for conditional GET support on /solar."""
+
+    @pytest.mark.asyncio
+    async def test_etag_matches_cached_body(self):
+        """The ETag hashes the cached body, and a matching client gets a 304 without querying."""
+        hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+        body = b'[{"timestamp":0,"wattHours":1.0,"sourceCount":1}]'
+        etag = weak_etag(body)
+        db = AsyncMock(spec=AsyncSession)
+
+        def request(*headers):
+            return Request({"type": "http", "method": "GET", "path": "/api/solar", "headers": list(headers)})
+
+        _solar_averages_cache.clear()
+        _solar_averages_cache.set((168, False, hour), (etag, body))
+        try:
+            full = await get_solar_averages(request=request(), db=db, hours=168, columnar=False, _access=None)
+            revalidated = await get_solar_averages(
+                request=request((b"if-none-match", etag.encode())),
+                db=db,
+                hours=168,
+                columnar=False,
+                _access=None,
+            )
+        finally:
+            _solar_averages_cache.clear()
+
+        assert full.body == body
+        assert full.headers["etag"] == etag
+        assert revalidated.status_code == 304
+        db.execute.assert_not_awaited()
+
+    def test_columnar_body_uses_sql_rounded_values(self):
+        """Columnar output carries the SQL-computed columns unchanged."""
+        rows = [(1_700_000_000_000, 12.35, 2), (1_700_003_600_000, 0.5, 1)]
+
+        body = orjson.loads(_solar_averages_body(rows, columnar=True))
+
+        assert body == {
+            "timestamp": [1_700_000_000_000, 1_700_003_600_000],
+            "wattHours": [12.35, 0.5],
+            "sourceCount": [2, 1],
+        }
+
+
+class TestNodeDisplayNames:
+    """Tests for the SQL-side node display name lookup."""
+
+    @pytest.mark.asyncio
+    async def test_no_nodes_skips_query(self):
+        """An empty node list returns no names without querying."""
+        db = AsyncMock(spec=AsyncSession)
+
+        assert await _node_display_names(db, []) == {}
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_fallback_chain_is_computed_in_sql(self):
+        """Names fall back long -> short -> !hex inside the query."""
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.return_value.all = MagicMock(return_value=[(1, "Alpha"), (2, "!00000002")])
+
+        names = await _node_display_names(db, iter([1, 2]))
+
+        assert names == {1: "Alpha", 2: "!00000002"}
+        stmt = db.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "coalesce(nullif(nodes.long_name" in sql
+        assert "to_hex(nodes.node_num)" in sql
+        assert "nodes.node_num IN" in sql
+        assert "DISTINCT ON (nodes.node_num)" in sql
+
+
 @pytest.mark.integration
 class TestSolarAnalysisEndpoint:
     """Integration tests for the /api/analysis/solar-nodes endpoint."""
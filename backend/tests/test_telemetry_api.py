@@ -1,6 +1,11 @@
 """Tests for telemetry API metric discovery and registry integration."""
 
 import os
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
 
 os.environ["TESTING"] = "true"
 
@@ -67,3 +72,103 @@ class TestMetricDiscoveryLogic:
         for ch in range(1, 9):
             assert f"ch{ch}_voltage" in METRIC_REGISTRY
             assert f"ch{ch}_current" in METRIC_REGISTRY
+
+
+class TestTelemetryHistoryQuery:
+    """Tests for the telemetry history endpoint's single SQL query."""
+
+    @pytest.mark.asyncio
+    async def test_dedup_and_legacy_fallback_run_in_sql(self):
+        """Metric rows and legacy column rows are merged and deduplicated in one query."""
+        from sqlalchemy.dialects import postgresql
+
+        from app.routers.ui import get_telemetry_history
+
+        received_at = datetime(2026, 1, 1, tzinfo=UTC)
+        statements = []
+
+        async def stream(stmt, *args, **kwargs):
+            statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+            class Result:
+                def __aiter__(self):
+                    async def rows():
+                        yield received_at, "src-1", "Source 1", 87.0
+
+                    return rows()
+
+            return Result()
+
+        db = MagicMock()
+        db.stream = stream
+
+        response = await get_telemetry_history(
+            node_num=5, metric="batteryLevel", db=db, hours=24, _access=None
+        )
+
+        assert len(statements) == 1
+        sql = statements[0]
+        assert "DISTINCT ON (anon_1.received_at, anon_1.source_id)" in sql
+        assert "UNION ALL" in sql
+        assert "CAST(telemetry.battery_level AS FLOAT)" in sql
+        assert orjson.loads(response.body) == {
+            "metric": "Battery Level",
+            "unit": "%",
+            "data": [
+                {
+                    "timestamp": "2026-01-01T00:00:00Z",
+                    "source_id": "src-1",
+                    "source_name": "Source 1",
+                    "value": 87.0,
+                }
+            ],
+        }
+
+
+class TestTelemetryListOutput:
+    """The telemetry list must serialize exactly as TelemetryResponse did."""
+
+    @pytest.mark.asyncio
+    async def test_matches_response_model(self):
+        """received_at keeps the Z suffix pydantic wrote for UTC timestamps."""
+        from app.models.telemetry import TelemetryType
+        from app.routers.ui import get_telemetry
+        from app.schemas.telemetry import TelemetryResponse
+
+        row = {
+            "id": "tel-1",
+            "source_id": "src-1",
+            "source_name": "Source 1",
+            "node_num": 5,
+            "telemetry_type": TelemetryType.DEVICE,
+            "battery_level": 87,
+            "voltage": 4.1,
+            "channel_utilization": None,
+            "air_util_tx": None,
+            "uptime_seconds": 3600,
+            "temperature": None,
+            "relative_humidity": None,
+            "barometric_pressure": None,
+            "current": None,
+            "snr_local": None,
+            "snr_remote": None,
+            "rssi": -90.0,
+            "received_at": datetime(2026, 1, 1, 8, 15, tzinfo=UTC),
+        }
+
+        class Result:
+            def mappings(self):
+                return self
+
+            async def partitions(self):
+                yield [row]
+
+        db = MagicMock()
+        db.stream = AsyncMock(return_value=Result())
+
+        response = await get_telemetry(node_num=5, db=db, hours=24, _access=None)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+
+        expected = TelemetryResponse(**{**row, "telemetry_type": row["telemetry_type"].value})
+        assert b'"received_at":"2026-01-01T08:15:00Z"' in body
+        assert orjson.loads(body) == [orjson.loads(expected.model_dump_json())]
@@ -7,6 +7,7 @@ os.environ["TESTING"] = "true"
 from app.models.telemetry import TelemetryType
 from app.telemetry_registry import (
     CAMEL_TO_METRIC,
+    METRIC_NAME_ALIASES,
     METRIC_REGISTRY,
     SUBMESSAGE_TYPE_MAP,
     get_metrics_by_type,
@@ -91,6 +92,22 @@ class TestCamelToMetric:
         assert CAMEL_TO_METRIC["co2"] == "co2"
 
 
+class TestMetricNameAliases:
+    """Tests for METRIC_NAME_ALIASES reverse mapping."""
+
+    def test_covers_every_metric(self):
+        """Every registered metric has an alias set containing its own name."""
+        assert METRIC_NAME_ALIASES.keys() == METRIC_REGISTRY.keys()
+        for name, aliases in METRIC_NAME_ALIASES.items():
+            assert name in aliases
+
+    def test_includes_camel_case_variants(self):
+        """camelCase names that resolve to a metric are among its aliases."""
+        assert METRIC_NAME_ALIASES["battery_level"] == {"battery_level", "batteryLevel"}
+        for camel, snake in CAMEL_TO_METRIC.items():
+            assert camel in METRIC_NAME_ALIASES[snake]
+
+
 class TestDedicatedColumns:
     """Tests for dedicated_column mappings."""
 